@@ -0,0 +1,153 @@
+"""
+Measures the bytes on the wire and the latency of REST_FRAMEWORK_CLIENT['COMPRESSION'] against a local stub server
+sending and receiving at a limited bandwidth.
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/compression.py [bandwidth in Mbit/s]
+"""
+import sys
+import gzip
+import json
+import time
+import zlib
+import random
+import timeit
+import threading
+import BaseHTTPServer
+from SocketServer import ThreadingMixIn
+from cStringIO import StringIO
+
+import django
+from django.conf import settings
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth'],
+    REST_FRAMEWORK_CLIENT={},
+)
+django.setup()
+
+import restframeworkclient
+
+PAGE_SIZE = 1000
+NOTES_SIZE = 50 * 1024
+
+bandwidth = 100 * 1e6
+wire = {'sent': 0, 'received': 0}
+
+
+def make_page():
+    random.seed(0)
+    return json.dumps({'count': PAGE_SIZE, 'next': None, 'previous': None, 'results': [{
+        'id': 133562 + i,
+        'name': u'J\xf6hn Smith %d' % i,
+        'email': 'john.smith.%d@example.org' % i,
+        'created_at': '2016-08-24T00:%02d:26Z' % (i % 60),
+        'balance': '%d.%02d' % (random.randint(0, 10 ** 4), random.randint(0, 99)),
+        'address': {'street': 'Main Street %d' % i, 'city': 'Bratislava', 'zip': '81101'},
+    } for i in range(PAGE_SIZE)]})
+
+
+def gzip_compress(body):
+    buf = StringIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as f:
+        f.write(body)
+    return buf.getvalue()
+
+
+PAGE = make_page()
+# Compressed once as servers often cache the compressed responses or compress them in a proxy
+GZIPPED_PAGE = gzip_compress(PAGE)
+
+
+def transfer(size):
+    time.sleep(size * 8 / bandwidth)
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Buffers the headers and the body into one write to avoid the delayed ACKs of small writes
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = PAGE
+        headers = {'Content-Type': 'application/json'}
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = GZIPPED_PAGE
+            headers['Content-Encoding'] = 'gzip'
+        self.respond(body, headers)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        wire['received'] += len(body)
+        transfer(len(body))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        assert len(body) > NOTES_SIZE
+        self.respond(json.dumps({'id': 1}), {'Content-Type': 'application/json'}, status=201)
+
+    def respond(self, body, headers, status=200):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        wire['sent'] += len(body)
+        transfer(len(body))
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The kept-alive connections are dropped on exit
+        pass
+
+
+server = StubServer(('127.0.0.1', 0), StubHandler)
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+BASE_URL = 'http://127.0.0.1:%d/v1' % server.server_port
+
+
+class Customer(restframeworkclient.Model):
+    class Meta:
+        resource = 'customers'
+        base_url = BASE_URL
+
+
+def get_page():
+    return Customer._execute_rest_call(Customer._resources_url(), 'GET')
+
+
+def save_customer():
+    Customer(name='John Smith', notes=json.dumps([{'line': i, 'text': 'Called about the invoice %d' % i}
+                                                  for i in range(NOTES_SIZE // 40)])).save()
+
+
+def report(name, func, number):
+    wire['sent'] = wire['received'] = 0
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    on_wire = (wire['sent'] + wire['received']) // (3 * number)
+    print('%-35s %10.1f ms %10d kB on the wire' % (name, best / number * 1e3, on_wire // 1024))
+
+
+if __name__ == '__main__':
+    bandwidth = float(sys.argv[1]) * 1e6 if len(sys.argv) > 1 else bandwidth
+    print('%d results per page, %d kB uncompressed, %g Mbit/s' % (PAGE_SIZE, len(PAGE) // 1024, bandwidth / 1e6))
+    for name, options in [
+        ('uncompressed', {'ACCEPT_ENCODING': 'identity', 'REQUEST_ENCODING': None}),
+        ('gzip', {'ACCEPT_ENCODING': 'gzip', 'REQUEST_ENCODING': 'gzip'}),
+    ]:
+        settings.REST_FRAMEWORK_CLIENT['COMPRESSION'] = {BASE_URL: options}
+        report('%s: GET a page' % name, get_page, 5)
+        report('%s: save() with a big body' % name, save_customer, 5)
+    # Lets the stub server finish the kept-alive connection before exiting
+    restframeworkclient.models._thread_local.session.close()
+    server.shutdown()
+    time.sleep(0.1)
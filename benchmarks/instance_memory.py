@@ -0,0 +1,115 @@
+"""
+Compares the memory used by the hydrated model instances with and without compact storage (Meta.compact).
+
+Each variant runs in a fresh interpreter and reports the size of the per instance containers (the instance, its __dict__
+or the dict of the fields' cache of the compact instances and the _attrs and _original_attrs mappings) and the growth
+of the resident set size (Linux only). The date of each instance is parsed so that the fields' cache is populated.
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/instance_memory.py [number of instances]
+"""
+import gc
+import os
+import sys
+import time
+import subprocess
+
+import django
+from django.conf import settings
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth'],
+    REST_FRAMEWORK_CLIENT={},
+)
+django.setup()
+
+import restframeworkclient
+
+
+class Device(restframeworkclient.Model):
+    customer = restframeworkclient.Reference('Customer')
+    activated_at = restframeworkclient.DateTimeField()
+
+    class Meta:
+        resource = 'devices'
+        base_url = 'http://example.org/v1'
+
+
+class CompactDevice(restframeworkclient.Model):
+    customer = restframeworkclient.Reference('Customer')
+    activated_at = restframeworkclient.DateTimeField()
+
+    class Meta:
+        resource = 'devices'
+        base_url = 'http://example.org/v1'
+        compact = True
+
+
+class Customer(restframeworkclient.Model):
+    class Meta:
+        resource = 'customers'
+        base_url = 'http://example.org/v1'
+
+
+VARIANTS = {'dict': Device, 'compact': CompactDevice}
+
+
+def make_results(number):
+    return [{
+        'id': i,
+        'customer': 1000 + i % 100,
+        'name': u'Device %d' % i,
+        'model': 'SM-G930F',
+        'serial_number': 'R58H%08d' % i,
+        'activated_at': '2016-08-24T00:34:26Z',
+        'firmware': '4.2.%d' % (i % 10),
+        'is_active': True,
+        'battery_level': i % 100,
+        'location': None,
+    } for i in range(number)]
+
+
+def resident_size():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError):
+        return None
+
+
+def container_size(instance):
+    size = sys.getsizeof(instance) + sys.getsizeof(instance._get_field_cache())
+    for attrs in (instance._attrs, instance._original_attrs):
+        size += sys.getsizeof(attrs)
+        if isinstance(attrs, restframeworkclient.compact.CompactAttrs):
+            size += sys.getsizeof(attrs._values) + sys.getsizeof(attrs._extras)
+    return size
+
+
+def measure(variant, number):
+    model = VARIANTS[variant]
+    results = make_results(number)
+    gc.collect()
+    rss_before = resident_size()
+    start = time.time()
+    instances = []
+    for result in results:
+        instance = model(**result)
+        instance._persisted = True
+        instance.activated_at
+        instances.append(instance)
+    elapsed = time.time() - start
+    gc.collect()
+    rss_after = resident_size()
+    rss = '%10.0f B/instance' % ((rss_after - rss_before) / float(number)) if rss_before else 'n/a'
+    print('%-10s %10.0f B/instance (containers) %s (RSS) %8.1f us/instance' % (
+        variant, container_size(instances[0]), rss, elapsed / number * 1e6))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        measure(sys.argv[2], int(sys.argv[1]))
+    else:
+        number = sys.argv[1] if len(sys.argv) > 1 else '20000'
+        for variant in sorted(VARIANTS, reverse=True):
+            subprocess.check_call([sys.executable, __file__, number, variant])
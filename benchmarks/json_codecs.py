@@ -0,0 +1,81 @@
+"""
+Compares the JSON codecs of restframeworkclient.jsoncodecs on list pages similar to real ones.
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/json_codecs.py [results per page]
+"""
+import sys
+import json
+import random
+import timeit
+import decimal
+import datetime
+
+import django
+from django.conf import settings
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth'],
+    REST_FRAMEWORK_CLIENT={},
+)
+django.setup()
+
+import requests
+
+from restframeworkclient import jsoncodecs
+
+
+def make_page(size):
+    random.seed(0)
+    created_at = datetime.datetime(2016, 8, 24, 0, 34, 26)
+    results = [{
+        'id': 133562 + i,
+        'name': u'J\xf6hn Smith %d' % i,
+        'email': 'john.smith.%d@example.org' % i,
+        'created_at': (created_at + datetime.timedelta(minutes=i)).isoformat() + 'Z',
+        'balance': str(decimal.Decimal(random.randint(0, 10 ** 6)) / 100),
+        'is_active': i % 3 != 0,
+        'customer': 1000 + i % 50,
+        'tags': ['vip', 'newsletter'][:i % 3],
+        'address': {'street': 'Main Street %d' % i, 'city': 'Bratislava', 'zip': '81101'},
+    } for i in range(size)]
+    return {'count': size * 20, 'next': 'http://example.org/v1/customers/?limit=%d&offset=%d' % (size, size),
+            'previous': None, 'results': results}
+
+
+def make_response(content):
+    response = requests.models.Response()
+    response.status_code = 200
+    response._content = content
+    # No charset in the Content-Type header so response.text has to guess the encoding like it often does
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+def report(name, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    print('%-45s %10.2f ms/page' % (name, best / number * 1e3))
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    page = make_page(size)
+    content = json.dumps(page)
+    number = max(1, 20000 // size)
+    print('page of %d results, %d kB' % (size, len(content) // 1024))
+
+    def previous():
+        response = make_response(content)
+        if response.text:
+            return response.json()
+    report('response.text + response.json()', previous, number)
+
+    for name in sorted(jsoncodecs.CODECS):
+        try:
+            codec = jsoncodecs._create_codec(name)
+        except ImportError:
+            print('%-45s %10s' % ('%s.loads(response.content)' % name, 'not installed'))
+            continue
+        assert codec.loads(content) == page
+        report('%s.loads(response.content)' % name, lambda: codec.loads(make_response(content).content), number)
+        report('%s.dumps(results)' % name, lambda: codec.dumps(page['results']), number)
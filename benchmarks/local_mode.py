@@ -0,0 +1,107 @@
+"""
+Measures the per-call overhead of REST_FRAMEWORK_CLIENT['USE_LOCAL_REST_FRAMEWORK'].
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/local_mode.py [number of calls]
+"""
+import sys
+import timeit
+import urlparse
+
+import django
+from django.conf import settings
+
+NUMBER_OF_APIS = 50
+
+settings.configure(
+    DEBUG=False,
+    SECRET_KEY='benchmark',
+    ROOT_URLCONF=__name__,
+    MIDDLEWARE=[],
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework'],
+    REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': [],
+        'DEFAULT_PERMISSION_CLASSES': [],
+        'UNAUTHENTICATED_USER': None,
+    },
+    REST_FRAMEWORK_CLIENT={
+        'USE_LOCAL_REST_FRAMEWORK': True,
+        'BASE_URLS': {'api-%d' % i: 'http://api-%d.example.org/v1' % i for i in range(NUMBER_OF_APIS)},
+    },
+)
+django.setup()
+
+from django.conf.urls import url
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+import restframeworkclient
+from restframeworkclient import local
+from restframeworkclient.utils import extend_url_query_string
+
+
+class CustomerView(APIView):
+    def get(self, request, pk):
+        return Response({'id': int(pk), 'name': 'John Smith', 'created_at': '2016-08-24T00:34:26Z'})
+
+
+urlpatterns = [
+    url(r'^api-%d/v1/customers/(?P<pk>\d+)/$' % (NUMBER_OF_APIS - 1), CustomerView.as_view()),
+]
+
+
+class Customer(restframeworkclient.Model):
+    class Meta:
+        resource = 'customers'
+        base_url = 'http://api-%d.example.org/v1' % (NUMBER_OF_APIS - 1)
+
+
+URL = Customer._resource_url(123)
+
+
+def linear_prefix_lookup(url):
+    for api, api_baseurl in settings.REST_FRAMEWORK_CLIENT.get('BASE_URLS').items():
+        if url.startswith(api_baseurl):
+            return api
+
+
+def call_with_new_client():
+    """
+    A bare APIClient call with the linear scan of BASE_URLS the client used before the compiled table.
+    """
+    client = APIClient()
+    api = linear_prefix_lookup(URL)
+    url_parsed = urlparse.urlparse(extend_url_query_string(URL, {}))
+    path = '/%s%s?%s' % (api, url_parsed.path, url_parsed.query)
+    response = client.get(path, {})
+    return response.data
+
+
+def call_with_rest_call():
+    """
+    The whole Model._execute_rest_call (batching, rate limits, ...) using the compiled table
+    """
+    return Customer._execute_rest_call(URL, 'GET')
+
+
+def call_with_dispatch():
+    settings.REST_FRAMEWORK_CLIENT['LOCAL_TRANSPORT'] = 'dispatch'
+    try:
+        return Customer._execute_rest_call(URL, 'GET')
+    finally:
+        del settings.REST_FRAMEWORK_CLIENT['LOCAL_TRANSPORT']
+
+
+def report(name, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    print('%-40s %10.1f us/call' % (name, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    assert call_with_new_client() == call_with_rest_call() == call_with_dispatch()
+    report('prefix lookup: linear scan', lambda: linear_prefix_lookup(URL), number * 10)
+    report('prefix lookup: compiled table', lambda: local.get_api_prefix(URL), number * 10)
+    report('local call: bare APIClient call', call_with_new_client, number)
+    report('local call: Model._execute_rest_call', call_with_rest_call, number)
+    report('local call: direct view dispatch', call_with_dispatch, number)
@@ -0,0 +1,85 @@
+"""
+Compares the cost of encoding the request bodies of save() as forms and as JSON (REST_FRAMEWORK_CLIENT['REQUEST_FORMAT'])
+and of decoding them on the server.
+
+Usage (from the repository root): PYTHONPATH=. python benchmarks/request_bodies.py [number of saves]
+"""
+import sys
+import json
+import timeit
+import datetime
+
+import django
+from django.conf import settings
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth'],
+    REST_FRAMEWORK_CLIENT={},
+)
+django.setup()
+
+from django.http import QueryDict
+from requests.models import RequestEncodingMixin
+
+import restframeworkclient
+
+
+class Customer(restframeworkclient.Model):
+    class Meta:
+        resource = 'customers'
+        base_url = 'http://example.org/v1'
+
+
+class Device(restframeworkclient.Model):
+    customer = restframeworkclient.Reference(Customer)
+
+    class Meta:
+        resource = 'devices'
+        base_url = 'http://example.org/v1'
+
+
+def make_device():
+    customer = Customer(id=133562, name='John Smith')
+    customer._persisted = True
+    return Device(
+        customer=customer,
+        name=u'J\xf6hn\'s phone',
+        activated_at=datetime.datetime(2016, 8, 24, 0, 34, 26),
+        settings={'language': 'sk', 'notifications': {'email': True, 'sms': False}, 'quiet_hours': [22, 7]},
+        address={'street': 'Main Street 1', 'city': 'Bratislava', 'zip': '81101'},
+        tags={'items': ['vip', 'newsletter', 'beta']},
+    )
+
+
+def encode_form(device):
+    return RequestEncodingMixin._encode_params(Device._postprocess_data(device._attrs))
+
+
+def encode_json(device):
+    kwargs = Device._encode_json_body({'json': Device._postprocess_data(device._attrs, encode_dicts=False)})
+    return kwargs['data']
+
+
+def decode_form(body):
+    # What a DRF serializer with JSONFields does with the form-encoded nested values
+    data = QueryDict(body)
+    return {k: json.loads(v) if v.startswith('{') else v for k, v in data.items()}
+
+
+def report(name, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=3))
+    print('%-40s %10.1f us/save' % (name, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    device = make_device()
+    form_body, json_body = encode_form(device), encode_json(device)
+    # The form values are strings and datetimes are formatted differently, the keys and the nested values match
+    assert decode_form(form_body)['settings'] == json.loads(json_body)['settings']
+    print('form body: %d bytes, JSON body: %d bytes' % (len(form_body), len(json_body)))
+    report('form: encode', lambda: encode_form(device), number)
+    report('json: encode', lambda: encode_json(device), number)
+    report('form: decode on the server', lambda: decode_form(form_body), number)
+    report('json: decode on the server', lambda: json.loads(json_body), number)
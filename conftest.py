@@ -5,5 +5,6 @@ from django.conf import settings
 def pytest_configure():
     settings.configure(INSTALLED_APPS=[
         'django.contrib.contenttypes',
+        'django.contrib.auth',
     ])
     django.setup()
@@ -30,3 +30,4 @@ from restframeworkclient.fields import *
 from restframeworkclient.filtering import *
 from restframeworkclient.methods import *
 from restframeworkclient.models import *
+from restframeworkclient.querylog import connection
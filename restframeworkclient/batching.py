@@ -0,0 +1,234 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import sys
+import time
+import threading
+import contextlib
+
+import six
+from six.moves.http_client import responses
+from django.conf import settings
+
+from restframeworkclient.exceptions import ServerResponseException
+from restframeworkclient.utils import extend_url_query_string
+
+DEFAULT_PATH = 'batch'
+DEFAULT_WINDOW = 0.01
+DEFAULT_MAX_SIZE = 50
+
+_thread_local = threading.local()
+
+# Batches collecting the calls over settings.REST_FRAMEWORK_CLIENT['BATCH_REQUESTS'][base_url]['WINDOW']
+_windowed_batches = {}
+_windowed_batches_lock = threading.Lock()
+
+
+class BatchItemResponse(object):
+    """
+    The part of the batch endpoint response belonging to one of the batched calls.
+
+    It provides the attributes needed by Model._handle_response_status_code.
+    """
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+        self.reason_phrase = responses.get(status_code, '')
+        self.content = data
+
+
+class _BatchedCall(object):
+    def __init__(self, model, item):
+        self.model = model
+        self.item = item
+        self.done = threading.Event()
+        self.response = None
+        self.exc_info = None
+
+    def get_response(self):
+        if self.exc_info is not None:
+            six.reraise(*self.exc_info)
+        return self.response
+
+
+class Batch(object):
+    """
+    Collects REST calls and sends them together in one request to the batch endpoint of their base URL.
+
+    The threads making the calls wait until the batch is sent, which happens when the first of them
+    has waited for `window` seconds, when `max_size` calls are collected or when the owner thread
+    (the one which entered the `with batch():` block) makes a call itself or leaves the block.
+    """
+    def __init__(self, window=DEFAULT_WINDOW, owner=None):
+        self.window = window
+        self.owner = owner
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def call(self, model, method, url, kwargs):
+        """
+        Adds the call to the batch and returns its BatchItemResponse once the batch is sent.
+        """
+        options = _get_options(model)
+        endpoint = _endpoint_url(model, options)
+        call = _BatchedCall(model, _item(model, method, url, kwargs))
+        with self._lock:
+            opened_at, calls = self._pending.setdefault(endpoint, (time.time(), []))
+            calls.append(call)
+            full = len(calls) >= options.get('MAX_SIZE', DEFAULT_MAX_SIZE)
+        if full or threading.current_thread() is self.owner:
+            self.flush(endpoint)
+        elif not call.done.wait(max(opened_at + self.window - time.time(), 0)):
+            self.flush(endpoint)
+        call.done.wait()
+        return call.get_response()
+
+    def flush(self, endpoint=None):
+        """
+        Sends the calls collected for the endpoint or for all endpoints if it is None.
+        """
+        with self._lock:
+            if endpoint is None:
+                groups = [(endpoint, calls) for endpoint, (_, calls) in self._pending.items()]
+                self._pending = {}
+            elif endpoint in self._pending:
+                groups = [(endpoint, self._pending.pop(endpoint)[1])]
+            else:
+                groups = []
+        for endpoint, calls in groups:
+            _send(endpoint, calls)
+
+
+def _send(endpoint, calls):
+    try:
+        results = calls[0].model._execute_rest_call(endpoint, 'POST', json=[call.item for call in calls])
+        if not isinstance(results, list) or len(results) != len(calls):
+            raise ServerResponseException('The batch endpoint %s returned %s results for %s calls' % (
+                endpoint, len(results) if isinstance(results, list) else None, len(calls)))
+    except Exception:
+        exc_info = sys.exc_info()
+        for call in calls:
+            call.exc_info = exc_info
+            call.done.set()
+        return
+    for call, result in zip(calls, results):
+        call.response = BatchItemResponse(result['status'], result.get('body'))
+        call.done.set()
+
+
+def _get_options(model):
+    return (getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('BATCH_REQUESTS') or {}).get(model._base_url())
+
+
+def _endpoint_url(model, options):
+    return '%s/%s/' % (model._base_url(), options.get('PATH', DEFAULT_PATH))
+
+
+def _item(model, method, url, kwargs):
+    """
+    Describes the call for the batch endpoint with the url relative to the base URL
+    """
+    item = {
+        'method': method.upper(),
+        'url': extend_url_query_string(url, kwargs.get('params') or {})[len(model._base_url()) + 1:],
+    }
+    if kwargs.get('json') is not None:
+        item['json'] = kwargs['json']
+    elif kwargs.get('data'):
+        # Like the requests library, ignore any None values in data
+        item['data'] = {k: v for k, v in kwargs['data'].items() if v is not None}
+    return item
+
+
+def get_batch(model, url, method, kwargs):
+    """
+    Returns the Batch the call should be added to or None if it should be made on its own.
+
+    Only calls to a base URL listed in settings.REST_FRAMEWORK_CLIENT['BATCH_REQUESTS'] without file uploads
+    or extra options of the requests library are batched. HEAD calls are not batched as the batch endpoint
+    doesn't return the response headers.
+    """
+    options = _get_options(model)
+    if options is None or method.upper() == 'HEAD':
+        return None
+    if not url.startswith(model._base_url() + '/') or url == _endpoint_url(model, options):
+        return None
+    if set(kwargs) - {'params', 'data', 'json'}:
+        return None
+    if any(hasattr(value, 'read') for value in (kwargs.get('data') or {}).values()):
+        return None
+    current = get_current()
+    if current is not None:
+        return current
+    window = options.get('WINDOW')
+    if not window:
+        return None
+    key = (model._base_url(), window)
+    batch = _windowed_batches.get(key)
+    if batch is None:
+        with _windowed_batches_lock:
+            batch = _windowed_batches.setdefault(key, Batch(window))
+    return batch
+
+
+def get_current():
+    """
+    Returns the Batch of the `with batch():` block this thread is in or None
+    """
+    stack = getattr(_thread_local, 'stack', None)
+    return stack[0] if stack else None
+
+
+def set_current(batch):
+    """
+    Makes the calls of this thread join batch, e.g. in a worker thread making REST calls on behalf of another one.
+    """
+    _thread_local.stack = [batch] if batch is not None else []
+
+
+@contextlib.contextmanager
+def batch(window=DEFAULT_WINDOW):
+    """
+    Sends the REST calls made in the block by the threads of restframeworkclient.concurrency
+    together in as few requests as possible, e.g.
+
+        with batch():
+            futures = [Customer.objects.aget(pk=pk) for pk in pks]
+        customers = concurrency.wait(futures)
+
+    A call made by the thread running the block itself sends the calls collected so far along with it
+    as the thread can't wait for any more of them.
+    Nested blocks join the batch already in progress.
+    """
+    if not hasattr(_thread_local, 'stack'):
+        _thread_local.stack = []
+    _thread_local.stack.append(get_current() or Batch(window, owner=threading.current_thread()))
+    try:
+        yield get_current()
+    finally:
+        current = _thread_local.stack.pop()
+        if not _thread_local.stack:
+            current.flush()
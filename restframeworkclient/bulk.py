@@ -0,0 +1,130 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import collections
+
+from restframeworkclient import concurrency
+
+
+class BulkItemResult(collections.namedtuple('BulkItemResult', ['instance', 'error'])):
+    """
+    The outcome of a bulk operation for one instance: error is None on success
+    or the exception raised when saving or deleting the instance.
+    """
+    __slots__ = ()
+
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def _bulk_url(model):
+    """
+    Returns the URL of the server-side bulk endpoint declared by Meta.bulk_endpoint or None
+    """
+    bulk_endpoint = getattr(model.Meta, 'bulk_endpoint', None)
+    if bulk_endpoint:
+        return model._resources_url() + bulk_endpoint + '/'
+    return None
+
+
+def _batches(items, batch_size):
+    if not batch_size:
+        return [items] if items else []
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def _call_bulk_endpoint(model, objs, method, batch_size, max_workers, get_payload, set_results=None):
+    """
+    Sends the objs in batches to the bulk endpoint and assigns the error of a failed batch to each of its items.
+    """
+    url = _bulk_url(model)
+
+    def call(batch):
+        json_ = model._rest_call(url, method=method, json=[get_payload(obj) for obj in batch])
+        if set_results is not None:
+            for obj, result in zip(batch, json_):
+                set_results(obj, result)
+
+    batches = _batches(objs, batch_size)
+    futures = concurrency.submit_bounded(call, batches, max_workers)
+    return [BulkItemResult(obj, future.exception())
+            for batch, future in zip(batches, futures)
+            for obj in batch]
+
+
+def _call_for_each(objs, func, max_workers):
+    futures = concurrency.submit_bounded(func, objs, max_workers)
+    return [BulkItemResult(obj, future.exception()) for obj, future in zip(objs, futures)]
+
+
+def bulk_create(model, objs, batch_size=None, max_workers=DEFAULT_MAX_WORKERS):
+    objs = list(objs)
+    if _bulk_url(model):
+        return _call_bulk_endpoint(model, objs, 'POST', batch_size, max_workers,
+                                   get_payload=lambda obj: model._postprocess_data(obj._attrs, encode_dicts=False),
+                                   set_results=lambda obj, json_: obj._set_saved_attrs(json_))
+    return _call_for_each(objs, lambda obj: obj._save(), max_workers)
+
+
+def bulk_update(model, objs, fields, batch_size=None, max_workers=DEFAULT_MAX_WORKERS):
+    objs = list(objs)
+    if _bulk_url(model):
+        def get_payload(obj):
+            data = {k: obj._attrs[k] for k in fields}
+            data[model._primary_key()] = obj.pk
+            return model._postprocess_data(data, encode_dicts=False)
+        return _call_bulk_endpoint(model, objs, 'PATCH', batch_size, max_workers,
+                                   get_payload=get_payload,
+                                   set_results=lambda obj, json_: obj._set_saved_attrs(json_, fields))
+    return _call_for_each(objs, lambda obj: obj._save(update_fields=fields), max_workers)
+
+
+def update(model, objs, values, batch_size=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Sets the same values to all objs on the server regardless of their local changes.
+    """
+    objs = list(objs)
+    if _bulk_url(model):
+        def get_payload(obj):
+            data = dict(values)
+            data[model._primary_key()] = obj.pk
+            return model._postprocess_data(data, encode_dicts=False)
+        return _call_bulk_endpoint(model, objs, 'PATCH', batch_size, max_workers,
+                                   get_payload=get_payload,
+                                   set_results=lambda obj, json_: obj._set_saved_attrs(json_))
+
+    def patch(obj):
+        json_ = obj._rest_call(obj._resource_url(obj.pk), method='PATCH', **model._body_kwargs(values))
+        obj._set_saved_attrs(json_)
+    return _call_for_each(objs, patch, max_workers)
+
+
+def bulk_delete(model, objs, batch_size=None, max_workers=DEFAULT_MAX_WORKERS):
+    objs = list(objs)
+    if _bulk_url(model):
+        return _call_bulk_endpoint(model, objs, 'DELETE', batch_size, max_workers,
+                                   get_payload=lambda obj: obj.pk)
+    return _call_for_each(objs, lambda obj: obj.delete(), max_workers)
@@ -0,0 +1,180 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import array
+import datetime
+import collections
+
+import dateutil.tz
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# The typecodes of the array module used for the NumPy dtypes when NumPy is not installed
+ARRAY_TYPECODES = {
+    'float64': 'd', 'f8': 'd', 'float': 'd',
+    'float32': 'f', 'f4': 'f',
+    'int64': 'l', 'i8': 'l', 'int': 'l',
+    'int32': 'i', 'i4': 'i',
+    'bool': 'b', '?': 'b',
+}
+
+
+def _naive_utc(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(dateutil.tz.tzutc()).replace(tzinfo=None)
+    return value
+
+
+def _time_of_day(value):
+    return datetime.timedelta(hours=value.hour, minutes=value.minute, seconds=value.second,
+                              microseconds=value.microsecond)
+
+
+def _field_column_type(field):
+    """
+    Returns the function converting the values received for the field to the values stored in its column
+    together with the default dtype of the column. Dates and times are converted to numbers without NumPy.
+    """
+    from restframeworkclient import fields
+    to_python = field.to_python if field is not None else (lambda value: value)
+    if isinstance(field, fields.DateTimeField):
+        if numpy is not None:
+            return lambda value: _naive_utc(to_python(value)) if value else None, 'datetime64[us]'
+        # Seconds since the epoch, NaN for None
+        return lambda value: (_naive_utc(to_python(value)) - EPOCH).total_seconds() if value else None, 'd'
+    if isinstance(field, fields.DateField):
+        if numpy is not None:
+            return lambda value: to_python(value) if value else None, 'datetime64[D]'
+        # Days since the epoch
+        return lambda value: float((to_python(value) - EPOCH.date()).days) if value else None, 'd'
+    if isinstance(field, fields.TimeField):
+        if numpy is not None:
+            return lambda value: _time_of_day(to_python(value)) if value else None, 'timedelta64[us]'
+        # Seconds since midnight
+        return lambda value: _time_of_day(to_python(value)).total_seconds() if value else None, 'd'
+    return to_python, None
+
+
+class Column(object):
+    """
+    A growable buffer of the values of one column, a NumPy array if NumPy is installed and the array module
+    or a list otherwise
+    """
+    def __init__(self, dtype=None, name=None):
+        self.size = 0
+        self.name = name
+        if numpy is not None:
+            self.data = numpy.empty(0, dtype=dtype or object)
+        elif dtype is not None:
+            self.data = array.array(ARRAY_TYPECODES.get(dtype, dtype))
+        else:
+            self.data = []
+
+    def reserve(self, capacity):
+        """
+        Grows the buffer to hold at least `capacity` values, only needed for NumPy arrays
+        """
+        if numpy is not None and capacity > len(self.data):
+            data = numpy.empty(capacity, dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+    def _check_no_none(self, values):
+        """
+        Integer and boolean columns have no value standing for None unlike the NaN of float columns
+        """
+        if None in values:
+            raise ValueError('The column %s of an integer or boolean dtype can\'t hold None, use a float dtype'
+                             % (self.name or ''))
+
+    def extend(self, values):
+        if numpy is None:
+            if isinstance(self.data, array.array):
+                # Like NumPy, convert e.g. the strings of decimals
+                if self.data.typecode in 'fd':
+                    values = [float('nan') if value is None else float(value) for value in values]
+                else:
+                    self._check_no_none(values)
+                    values = [int(value) for value in values]
+            self.data.extend(values)
+            self.size += len(values)
+            return
+        if self.size + len(values) > len(self.data):
+            self.reserve(max(self.size + len(values), 2 * len(self.data)))
+        if self.data.dtype.kind in 'iub':
+            self._check_no_none(values)
+        if self.data.dtype == object:
+            # Assigning the list at once would make NumPy look into values which are lists themselves
+            for i, value in enumerate(values, self.size):
+                self.data[i] = value
+        else:
+            self.data[self.size:self.size + len(values)] = numpy.array(values, dtype=self.data.dtype)
+        self.size += len(values)
+
+    def finish(self):
+        if numpy is not None and self.size < len(self.data):
+            return self.data[:self.size].copy()
+        return self.data
+
+
+class ColumnsBuilder(object):
+    """
+    Collects the values of the given fields from the results received from the server into columns,
+    converting the values of the declared fields by their type, e.g. DateTimeField values to datetime64
+    """
+    def __init__(self, model, field_names, dtypes=None):
+        from restframeworkclient import fields
+        dtypes = dtypes or {}
+        self.columns = collections.OrderedDict()
+        self.getters = []
+        for name in field_names:
+            key = model._primary_key() if name == 'pk' else name
+            field = getattr(model, key, None)
+            if isinstance(field, (fields.ReverseReference, fields.FileField)) or \
+                    not isinstance(field, fields.Field):
+                field = None
+            convert, dtype = _field_column_type(field)
+            self.columns[name] = Column(dtypes.get(name, dtype), name)
+            self.getters.append((field.field_name if field is not None else key, convert))
+
+    def reserve(self, capacity):
+        for column in self.columns.values():
+            column.reserve(capacity)
+
+    def extend(self, results):
+        """
+        :param results: list of dicts of the attributes of the results
+        """
+        for column, (key, convert) in zip(self.columns.values(), self.getters):
+            column.extend([convert(result.get(key)) for result in results])
+
+    def finish(self):
+        return collections.OrderedDict((name, column.finish()) for name, column in self.columns.items())
@@ -0,0 +1,224 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import copy
+import threading
+import collections
+
+# The number of attributes a KeyIndex holds at most, any other attributes are kept in a dict of extras
+MAX_INDEX_SIZE = 128
+
+_MISSING = object()
+
+
+class KeyIndex(object):
+    """
+    Maps the attribute names of the instances of one model to the positions of their values in CompactAttrs.
+
+    The index is shared by all instances of the model. It only grows, by the attributes received
+    which are not declared.
+    """
+    def __init__(self, keys=()):
+        self.keys = []
+        self.positions = {}
+        self._lock = threading.Lock()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        """
+        Returns the position of the key, adding the key unless the index is full in which case None is returned
+        """
+        position = self.positions.get(key)
+        if position is not None or len(self.keys) >= MAX_INDEX_SIZE:
+            return position
+        with self._lock:
+            if key not in self.positions and len(self.keys) < MAX_INDEX_SIZE:
+                self.keys.append(key)
+                self.positions[key] = len(self.keys) - 1
+            return self.positions.get(key)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class CompactAttrs(object):
+    """
+    A dict-like mapping of the attributes of a model instance storing the values in a list ordered by
+    a KeyIndex shared by the instances of the model instead of a dict per instance.
+    Keys not in the index are kept in a dict of extras.
+    """
+    __slots__ = ('_index', '_values', '_extras')
+
+    def __init__(self, index, items=()):
+        self._index = index
+        self._values = []
+        self._extras = None
+        if hasattr(items, 'items'):
+            items = items.items()
+        for key, value in items:
+            self[key] = value
+
+    def __getitem__(self, key):
+        position = self._index.positions.get(key)
+        if position is not None:
+            if position < len(self._values):
+                value = self._values[position]
+                if value is not _MISSING:
+                    return value
+        elif self._extras is not None and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        position = self._index.add(key)
+        if position is None:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+            return
+        values = self._values
+        if position >= len(values):
+            values.extend([_MISSING] * (position + 1 - len(values)))
+        values[position] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        position = self._index.positions.get(key)
+        if position is not None:
+            self._values[position] = _MISSING
+        else:
+            del self._extras[key]
+
+    def __contains__(self, key):
+        position = self._index.positions.get(key)
+        if position is not None:
+            return position < len(self._values) and self._values[position] is not _MISSING
+        return self._extras is not None and key in self._extras
+
+    def __iter__(self):
+        for key, value in zip(self._index.keys, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._extras:
+            for key in list(self._extras):
+                yield key
+
+    def __len__(self):
+        return sum(1 for value in self._values if value is not _MISSING) + len(self._extras or ())
+
+    def iteritems(self):
+        for key in self:
+            yield key, self[key]
+
+    def itervalues(self):
+        for key in self:
+            yield self[key]
+
+    iterkeys = __iter__
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
+    def update(self, *args, **kwargs):
+        for mapping in args + (kwargs,):
+            for key, value in (mapping.items() if hasattr(mapping, 'items') else mapping):
+                self[key] = value
+
+    def clear(self):
+        self._values = []
+        self._extras = None
+
+    def copy(self):
+        return CompactAttrs(self._index, self.iteritems())
+
+    def __deepcopy__(self, memo):
+        attrs = CompactAttrs(self._index)
+        attrs._values = [value if value is _MISSING else copy.deepcopy(value, memo) for value in self._values]
+        if self._extras is not None:
+            attrs._extras = copy.deepcopy(self._extras, memo)
+        return attrs
+
+    def __reduce__(self):
+        return CompactAttrs, (self._index, self.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, (CompactAttrs, dict)):
+            return NotImplemented
+        return dict(self.iteritems()) == dict(other.items())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.iteritems()))
+
+
+collections.MutableMapping.register(CompactAttrs)
+
+
+def copy_attrs(index, attrs):
+    """
+    Returns a deep copy of the dict or CompactAttrs attrs as CompactAttrs
+    """
+    return CompactAttrs(index, ((key, copy.deepcopy(value)) for key, value in attrs.items()))
@@ -0,0 +1,102 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import zlib
+
+import six
+import urllib3.util.request
+from django.conf import settings
+from requests.models import RequestEncodingMixin
+
+DEFAULT_MIN_REQUEST_SIZE = 1024
+
+# zlib window bits of the gzip and zlib ("deflate" in HTTP) containers
+_WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+def get_options(model):
+    """
+    Returns the compression options of the base URL of the model from settings.REST_FRAMEWORK_CLIENT['COMPRESSION']
+    or None if they are not set.
+
+    ACCEPT_ENCODING: the codings the responses may use, all the codings the requests library can decode by default
+    REQUEST_ENCODING: 'gzip' (default), 'deflate' or None to send the request bodies uncompressed
+    MIN_REQUEST_SIZE: the bodies shorter than this number of bytes are sent uncompressed, 1024 by default
+    LEVEL: the zlib compression level, 6 by default
+    """
+    options = (getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('COMPRESSION') or {}).get(model._base_url())
+    if options is None:
+        return None
+    return {
+        'ACCEPT_ENCODING': options.get('ACCEPT_ENCODING', urllib3.util.request.ACCEPT_ENCODING),
+        'REQUEST_ENCODING': options.get('REQUEST_ENCODING', 'gzip'),
+        'MIN_REQUEST_SIZE': options.get('MIN_REQUEST_SIZE', DEFAULT_MIN_REQUEST_SIZE),
+        'LEVEL': options.get('LEVEL', 6),
+    }
+
+
+def compress(body, encoding, level=6):
+    if isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    return compressor.compress(body) + compressor.flush()
+
+
+def prepare_request(model, kwargs):
+    """
+    Returns the kwargs of the requests library call with the Accept-Encoding header and the body compressed
+    according to the compression options of the model, see get_options.
+
+    Form-encoded bodies are encoded here in order to be compressed. Bodies with files are never compressed.
+    The responses are decompressed by the requests library while they are read.
+    """
+    options = get_options(model)
+    if options is None:
+        return kwargs
+    kwargs = kwargs.copy()
+    headers = dict(kwargs.get('headers') or {})
+    headers.setdefault('Accept-Encoding', options['ACCEPT_ENCODING'])
+    kwargs['headers'] = headers
+
+    body = kwargs.get('data')
+    if not body or not options['REQUEST_ENCODING'] or kwargs.get('files'):
+        return kwargs
+    content_type = None
+    if isinstance(body, dict):
+        if any(hasattr(value, 'read') for value in body.values()):
+            return kwargs
+        body = RequestEncodingMixin._encode_params(body)
+        content_type = 'application/x-www-form-urlencoded'
+    if not isinstance(body, (six.binary_type, six.text_type)) or len(body) < options['MIN_REQUEST_SIZE']:
+        return kwargs
+    kwargs['data'] = compress(body, options['REQUEST_ENCODING'], options['LEVEL'])
+    headers['Content-Encoding'] = options['REQUEST_ENCODING']
+    if content_type is not None:
+        headers.setdefault('Content-Type', content_type)
+    return kwargs
@@ -0,0 +1,161 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import sys
+import threading
+import collections
+from multiprocessing.pool import ThreadPool
+
+import six
+from django.conf import settings
+
+from restframeworkclient import batching, querylog, unitofwork
+from restframeworkclient.exceptions import FutureTimeoutError
+from restframeworkclient.middleware import get_request, set_request
+
+DEFAULT_THREAD_POOL_SIZE = 10
+
+_pool = None
+_pool_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+class Future(object):
+    """
+    The eventual result of a call running on the thread pool.
+
+    Mimics the API of concurrent.futures.Future of Python 3 which is not available here.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._exc_info = None
+
+    def _set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def _set_exc_info(self, exc_info):
+        self._exc_info = exc_info
+        self._event.set()
+
+    def done(self):
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Waits for the call to finish and returns its return value or re-raises its exception.
+        """
+        if not self._event.wait(timeout):
+            raise FutureTimeoutError('The call did not finish in %s seconds' % timeout)
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call to finish and returns the exception it raised or None.
+        """
+        if not self._event.wait(timeout):
+            raise FutureTimeoutError('The call did not finish in %s seconds' % timeout)
+        return self._exc_info[1] if self._exc_info is not None else None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('THREAD_POOL_SIZE',
+                                                                            DEFAULT_THREAD_POOL_SIZE)
+                _pool = ThreadPool(size)
+    return _pool
+
+
+def _run(future, func, args, kwargs, request, batch, log, unit_of_work):
+    """
+    Runs func in the context of the thread that submitted it so that the per-request cache,
+    the batch of REST calls, the log of the calls and the unit of work are shared.
+    """
+    set_request(request)
+    batching.set_current(batch)
+    querylog.set_current(log)
+    unitofwork.set_current(unit_of_work)
+    _thread_local.in_pool = True
+    try:
+        future._set_result(func(*args, **kwargs))
+    except Exception:
+        future._set_exc_info(sys.exc_info())
+    finally:
+        _thread_local.in_pool = False
+        unitofwork.set_current(None)
+        querylog.set_current(None)
+        batching.set_current(None)
+        set_request(None)
+
+
+def submit(func, *args, **kwargs):
+    """
+    Schedules func(*args, **kwargs) to be called on the thread pool shared by the whole process
+    and returns its Future.
+
+    The pool size is set by settings.REST_FRAMEWORK_CLIENT['THREAD_POOL_SIZE'] (10 by default).
+    Calls submitted from the pool threads themselves are run immediately in order to avoid exhausting the pool
+    by threads waiting for each other.
+    """
+    future = Future()
+    if getattr(_thread_local, 'in_pool', False):
+        try:
+            future._set_result(func(*args, **kwargs))
+        except Exception:
+            future._set_exc_info(sys.exc_info())
+    else:
+        _get_pool().apply_async(_run, (future, func, args, kwargs, get_request(), batching.get_current(),
+                                       querylog.get_current(), unitofwork.get_current()))
+    return future
+
+
+def wait(futures):
+    """
+    Returns the results of all futures in the same order, re-raising the first exception if any.
+    """
+    return [future.result() for future in futures]
+
+
+def submit_bounded(func, items, max_workers):
+    """
+    Like [submit(func, item) for item in items] but with at most max_workers calls in flight at the same time.
+    It returns when the last call has been submitted.
+    """
+    futures = []
+    in_flight = collections.deque()
+    for item in items:
+        if len(in_flight) >= max_workers:
+            in_flight.popleft().exception()
+        future = submit(func, item)
+        futures.append(future)
+        in_flight.append(future)
+    return futures
@@ -74,3 +74,18 @@ class NoneValueInParams(Exception):
     Occurs when passing None to a filter argument instead of using something__isnull=True.
     """
     pass
+
+
+class FutureTimeoutError(Exception):
+    """
+    Occurs when the result of a Future is not available within the given timeout.
+    """
+    pass
+
+
+class NPlusOneError(Exception):
+    """
+    Occurs when the same field of different instances is dereferenced by separate REST calls
+    in one request and settings.REST_FRAMEWORK_CLIENT['N_PLUS_ONE']['ACTION'] is 'raise'.
+    """
+    pass
@@ -0,0 +1,93 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import csv
+import collections
+
+import six
+
+from restframeworkclient import jsoncodecs
+
+FORMATS = ('jsonl', 'csv')
+
+
+def _attribute_name(model, name):
+    """
+    Returns the name of the attribute received from the server for the field name
+    """
+    from restframeworkclient import fields
+    if name == 'pk':
+        return model._primary_key()
+    field = getattr(model, name, None)
+    if isinstance(field, fields.Field) and not isinstance(field, fields.ReverseReference):
+        return field.field_name
+    return name
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return jsoncodecs.get_codec().dumps(value)
+    if isinstance(value, six.text_type):
+        # The csv module of Python 2 writes bytes only
+        return value.encode('utf-8')
+    return value
+
+
+def export_pages(model, pages, fileobj, format='jsonl', fields=None):
+    """
+    Writes the results of each page to fileobj as JSON Lines or CSV
+
+    :param pages: iterable of the lists of the results as received from the server
+    :param fields: the field names to write, by default all attributes received (for CSV those of the first result)
+    :return: the number of results written
+    """
+    if format not in FORMATS:
+        raise ValueError('Unsupported export format %r, expected one of %s' % (format, ', '.join(FORMATS)))
+    codec = jsoncodecs.get_codec()
+    names = list(fields) if fields is not None else None
+    keys = [_attribute_name(model, name) for name in names] if names is not None else None
+    writer = csv.writer(fileobj) if format == 'csv' else None
+    header_written = False
+    count = 0
+    for results in pages:
+        if format == 'jsonl':
+            if keys is not None:
+                results = [collections.OrderedDict((name, result.get(key)) for name, key in zip(names, keys))
+                           for result in results]
+            fileobj.write(''.join(codec.dumps(result) + '\n' for result in results))
+        else:
+            if keys is None:
+                if not results:
+                    continue
+                names = keys = sorted(results[0])
+            if not header_written:
+                writer.writerow(names)
+                header_written = True
+            writer.writerows([_csv_value(result.get(key)) for key in keys] for result in results)
+        count += len(results)
+    if writer is not None and not header_written and names:
+        writer.writerow(names)
+    return count
@@ -24,13 +24,18 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+import re
+import six
 import copy
 import datetime
 import urlparse
+import collections
 
+import dateutil.tz
 import dateutil.parser
 from django.utils.functional import curry
 
+from restframeworkclient import concurrency, querylog
 from restframeworkclient.filtering import PartiallyFiltered
 from restframeworkclient.utils import ObjRef, lookup_by_objref, setattr_lazy
 
@@ -90,14 +95,27 @@ class Field(object):
             instance._attrs[self.field_name] = value
 
         # Invalidate cache
-        if hasattr(instance, self._cache_key()):
-            delattr(instance, self._cache_key())
+        cache = instance._get_field_cache(create=False)
+        if cache:
+            cache.pop(self._cache_key(), None)
 
     def __get__(self, instance, owner):
         if not instance:
             return self
         return instance._attrs[self.field_name]
 
+    def to_python(self, value):
+        """
+        Converts a value received from the server or given to a filter to the type represented by the field
+        """
+        return value
+
+    def python_value(self, instance):
+        """
+        Returns the value of the instance converted by to_python without fetching any referenced instances
+        """
+        return self.to_python(instance._attrs.get(self.field_name))
+
 
 class Reference(ModelPropertyMixin, Field):
     """
@@ -115,7 +133,8 @@ class Reference(ModelPropertyMixin, Field):
     def __get__(self, instance, owner):
         if not instance:
             return self
-        if not hasattr(instance, self._cache_key()):
+        cache = instance._get_field_cache()
+        if self._cache_key() not in cache:
             value = instance._attrs[self.field_name]
             from restframeworkclient.models import Model
             if isinstance(value, Model):
@@ -127,8 +146,9 @@ class Reference(ModelPropertyMixin, Field):
             pk = value
             if pk is None:
                 return None
-            setattr(instance, self._cache_key(), self.model.objects.get(pk=pk))
-        return getattr(instance, self._cache_key())
+            with querylog.accessing((owner, self.field_name)):
+                cache[self._cache_key()] = self.model.objects.get(pk=pk)
+        return cache[self._cache_key()]
 
     def contribute_to_class(self, cls, name):
         super(Reference, self).contribute_to_class(cls, name)
@@ -145,6 +165,14 @@ class Reference(ModelPropertyMixin, Field):
         setter = getter.setter(curry(self.foo_id_setter, field=self))
         setattr(cls, '%s_id' % self.field_name, setter)
 
+    def to_python(self, value):
+        from restframeworkclient.models import Model
+        if isinstance(value, Model):
+            return value.pk
+        if isinstance(value, dict):
+            return value.get(self.model._primary_key())
+        return value
+
     def foo_id_getter(self, instance, field):
         # Currently assumes references consists of primary keys and not URLs
         value = instance._attrs[field.field_name]
@@ -199,20 +227,19 @@ class ReverseReference(ModelPropertyMixin, Field):
             params.update(self.filters)
         if self.one_to_one:
             params[self.field_name] = instance.pk
+            cache = instance._get_field_cache()
             cache_key = '_cached_instance_%s' % self.field_name
-            if not hasattr(instance, cache_key):
-                setattr(instance, cache_key, self.model.objects.get(**params))
-            return getattr(instance, cache_key)
+            if cache_key not in cache:
+                with querylog.accessing((owner, self._attr_name)):
+                    cache[cache_key] = self.model.objects.get(**params)
+            return cache[cache_key]
         else:
             partially_filtered = getattr(instance, '_partially_filtered', None)
             if partially_filtered and \
                     self._attr_name in partially_filtered._prefetch_related:
-                cache_key = '_prefetch_related_results_%s' % self._attr_name
+                cache_key = self._prefetch_cache_key()
                 if not hasattr(partially_filtered, cache_key):
-                    prefetch_related_ids = [obj.pk for obj in partially_filtered]
-                    params['%s__in' % self.field_name] = prefetch_related_ids
-                    multiplexed_results = PartiallyFiltered(_model=self.model, **params)
-                    setattr(partially_filtered, cache_key, multiplexed_results)
+                    self._prefetch(partially_filtered, list(partially_filtered))
                 multiplexed_results = getattr(partially_filtered, cache_key)
 
                 class DemultiplexingPartiallyFiltered(PartiallyFiltered):
@@ -221,10 +248,36 @@ class ReverseReference(ModelPropertyMixin, Field):
                                    if getattr(obj, '%s_id' % self.field_name) == instance.pk]
                         return results
 
+                    def _materialized_results(that):
+                        return that._results()
+
+                    def _copy(that):
+                        # Further filtering is done on the server unless it can be done on the results
+                        return PartiallyFiltered._copy(that, cls=PartiallyFiltered)
+
+                params[self.field_name] = instance.pk
                 return DemultiplexingPartiallyFiltered(_model=self.model, **params)
             else:
                 params[self.field_name] = instance.pk
-                return PartiallyFiltered(_model=self.model, **params)
+                partially_filtered = PartiallyFiltered(_model=self.model, **params)
+                partially_filtered._accessed_by = (owner, self._attr_name)
+                return partially_filtered
+
+    def _prefetch_cache_key(self):
+        return '_prefetch_related_results_%s' % self._attr_name
+
+    def _prefetch(self, partially_filtered, instances):
+        """
+        Stores the related instances of all instances of partially_filtered on partially_filtered
+        so that they can be fetched at once.
+        """
+        params = {}
+        if self.filters:
+            params.update(self.filters)
+        params['%s__in' % self.field_name] = [obj.pk for obj in instances]
+        multiplexed_results = PartiallyFiltered(_model=self.model, **params)
+        setattr(partially_filtered, self._prefetch_cache_key(), multiplexed_results)
+        return multiplexed_results
 
     @property
     def related(self):
@@ -237,52 +290,135 @@ class ReverseReference(ModelPropertyMixin, Field):
         return RelatedObject()
 
 
-class DateTimeField(Field):
+_ISO_DATETIME = re.compile(r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6})\d*)?)?'
+                           r'(Z|[+-]\d{2}(?::?\d{2})?)?$')
+_ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})$')
+_ISO_TIME = re.compile(r'(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6})\d*)?)?$')
+_tzoffsets = {}
+
+
+def _tzinfo(designator):
     """
-    Parses string attributes as datetime.datetime objects
+    Returns the same tzinfo instances dateutil.parser.parse does for the time zone designators of ISO 8601
     """
-    def __init__(self, field_name=None):
-        Field.__init__(self, field_name)
+    if designator is None:
+        return None
+    if designator == 'Z':
+        return dateutil.tz.tzutc()
+    tzinfo = _tzoffsets.get(designator)
+    if tzinfo is None:
+        digits = designator[1:].replace(':', '')
+        offset = int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60
+        offset = -offset if designator[0] == '-' else offset
+        tzinfo = _tzoffsets[designator] = dateutil.tz.tzutc() if offset == 0 else dateutil.tz.tzoffset(None, offset)
+    return tzinfo
+
+
+def parse_datetime(value):
+    """
+    Parses the strings in the ISO 8601 format used by Django REST Framework without the general dateutil parser
+    which is used for any other format.
+    """
+    match = _ISO_DATETIME.match(value)
+    if match is None:
+        return dateutil.parser.parse(value)
+    year, month, day, hour, minute, second, fraction, designator = match.groups()
+    return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0),
+                             int(fraction.ljust(6, '0')) if fraction else 0, _tzinfo(designator))
+
+
+def parse_date(value):
+    match = _ISO_DATE.match(value)
+    if match is None:
+        return dateutil.parser.parse(value).date()
+    year, month, day = match.groups()
+    return datetime.date(int(year), int(month), int(day))
+
 
+def parse_time(value):
+    match = _ISO_TIME.match(value)
+    if match is None:
+        return dateutil.parser.parse(value).time()
+    hour, minute, second, fraction = match.groups()
+    return datetime.time(int(hour), int(minute), int(second or 0), int(fraction.ljust(6, '0')) if fraction else 0)
+
+
+class ParsedField(Field):
+    """
+    Base class for the fields converting the values received from server by to_python.
+
+    The converted value is cached on the instance as long as the value received stays the same.
+    """
     def __get__(self, instance, owner):
         if not instance:
             return self
-        value = instance._attrs[self.field_name]
+        return self._cached_to_python(instance, instance._attrs[self.field_name])
+
+    def python_value(self, instance):
+        return self._cached_to_python(instance, instance._attrs.get(self.field_name))
+
+    def _cached_to_python(self, instance, value):
+        cache = instance._get_field_cache()
+        cached = cache.get(self._cache_key())
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        python_value = self.to_python(value)
+        cache[self._cache_key()] = (value, python_value)
+        return python_value
+
+    def parse_column(self, instances):
+        """
+        Converts the values of all instances at once, e.g. of a page of results, converting each distinct value once
+        """
+        parsed = {}
+        key = self._cache_key()
+        for instance in instances:
+            value = instance._attrs.get(self.field_name)
+            if not isinstance(value, six.string_types):
+                continue
+            python_value = parsed.get(value)
+            if python_value is None:
+                python_value = parsed[value] = self.to_python(value)
+            instance._get_field_cache()[key] = (value, python_value)
+
+
+class DateTimeField(ParsedField):
+    """
+    Parses string attributes as datetime.datetime objects
+    """
+    def __init__(self, field_name=None):
+        Field.__init__(self, field_name)
+
+    def to_python(self, value):
         if isinstance(value, datetime.datetime):
             return value
-        return dateutil.parser.parse(value) if value else value
+        return parse_datetime(value) if value else value
 
 
-class DateField(Field):
+class DateField(ParsedField):
     """
     Parses string attributes as datetime.date objects
     """
     def __init__(self, field_name=None):
         Field.__init__(self, field_name)
 
-    def __get__(self, instance, owner):
-        if not instance:
-            return self
-        value = instance._attrs[self.field_name]
+    def to_python(self, value):
         if isinstance(value, datetime.date):
             return value
-        return dateutil.parser.parse(value).date() if value else None
+        return parse_date(value) if value else None
 
 
-class TimeField(Field):
+class TimeField(ParsedField):
     """
     Parses string attributes as datetime.time objects
     """
     def __init__(self, field_name=None):
         Field.__init__(self, field_name)
 
-    def __get__(self, instance, owner):
-        if not instance:
-            return self
-        value = instance._attrs[self.field_name]
+    def to_python(self, value):
         if isinstance(value, datetime.time):
             return value
-        return dateutil.parser.parse(value).time() if value else None
+        return parse_time(value) if value else None
 
 
 class FileField(Field):
@@ -308,10 +444,7 @@ class FileField(Field):
 
 def _get_model_by_content_type(content_type, default=None):
     from restframeworkclient import models
-    for model in models.all_models:
-        if hasattr(model, 'Meta') and getattr(model.Meta, 'content_type', None) == content_type:
-            return model
-    return default
+    return models.models_by_content_type.get(content_type, default)
 
 
 class GenericRelationField(object):
@@ -323,17 +456,63 @@ class GenericRelationField(object):
     def __init__(self, content_type_field, object_id_field):
         self.content_type_field = content_type_field
         self.object_id_field = object_id_field
+        # Unknown unless the field is declared in the class body, see contribute_to_class
+        self._attr_name = None
+
+    def contribute_to_class(self, cls, name):
+        self._attr_name = name
 
     def __get__(self, instance, owner):
         if not instance:
             return self
-        model = _get_model_by_content_type(getattr(instance, self.content_type_field).value)
+        content_type = getattr(instance, self.content_type_field).value
+        object_id = getattr(instance, self.object_id_field)
+        model = _get_model_by_content_type(content_type)
         if model:
-            return model.objects.get(pk=getattr(instance, self.object_id_field))
+            partially_filtered = getattr(instance, '_partially_filtered', None)
+            if partially_filtered and self._attr_name is not None and \
+                    self._attr_name in partially_filtered._prefetch_related:
+                cache_key = self._prefetch_cache_key()
+                if not hasattr(partially_filtered, cache_key):
+                    self._prefetch(partially_filtered, list(partially_filtered))
+                obj = getattr(partially_filtered, cache_key).get((content_type, six.text_type(object_id)))
+                if obj is not None:
+                    return obj
+            with querylog.accessing((owner, self._attr_name) if self._attr_name is not None else None):
+                return model.objects.get(pk=object_id)
         else:
             raise ValueError('Content type "%s" not found in meta of any client model.',
                              self.content_type_field)
 
+    def _prefetch_cache_key(self):
+        return '_prefetch_related_results_%s' % self._attr_name
+
+    def _prefetch(self, partially_filtered, instances):
+        """
+        Fetches the related instances of all instances of partially_filtered with one query per content type
+        and stores them on partially_filtered in a dict by content type and primary key.
+        """
+        object_ids_by_content_type = collections.defaultdict(set)
+        for instance in instances:
+            object_id = getattr(instance, self.object_id_field)
+            if object_id is not None:
+                object_ids_by_content_type[getattr(instance, self.content_type_field).value].add(object_id)
+
+        def fetch(content_type, object_ids):
+            model = _get_model_by_content_type(content_type)
+            if model is None:
+                return []
+            params = {'%s__in' % model._primary_key(): sorted(object_ids)}
+            return [(content_type, obj) for obj in model.objects.filter(**params)]
+
+        futures = [concurrency.submit(fetch, content_type, object_ids)
+                   for content_type, object_ids in object_ids_by_content_type.items()]
+        prefetched = {(content_type, six.text_type(obj.pk)): obj
+                      for results in concurrency.wait(futures)
+                      for content_type, obj in results}
+        setattr(partially_filtered, self._prefetch_cache_key(), prefetched)
+        return prefetched
+
     def __set__(self, instance, value):
         instance._original_attrs[self.content_type_field] = value.Meta.content_type
         instance._original_attrs[self.object_id_field] = value.pk
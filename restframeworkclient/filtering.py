@@ -24,12 +24,17 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+import time
 import datetime
+import itertools
+import collections
 
 from django.utils import timezone
 from django.core.exceptions import MultipleObjectsReturned
 
-from restframeworkclient.utils import Indexable, min_ignoring_nones
+from restframeworkclient import bulk, columns, concurrency, exporting, lookups, querylog, streaming
+from restframeworkclient.utils import AdaptivePageSize, Indexable, extend_url_query_string, min_ignoring_nones, \
+    offset_page_urls
 
 
 class PartiallyFiltered(object):
@@ -43,10 +48,21 @@ class PartiallyFiltered(object):
         self.model = _model
         self.params = kwargs
         self._prefetch_related = []
-
-    def _copy(self):
-        partially_filtered = self.__class__(_model=self.model, **self.params.copy())
+        self._prefetch_related_eagerly = False
+        self._page_size = None
+        self._adaptive_page_size = False
+        # The model class and the name of the ReverseReference returning this queryset, see querylog.accessing
+        self._accessed_by = None
+        # Set on the querysets returned by Manager, see delete
+        self._is_manager_queryset = False
+
+    def _copy(self, cls=None):
+        partially_filtered = (cls or self.__class__)(_model=self.model, **self.params.copy())
         partially_filtered._prefetch_related = self._prefetch_related
+        partially_filtered._prefetch_related_eagerly = self._prefetch_related_eagerly
+        partially_filtered._page_size = self._page_size
+        partially_filtered._adaptive_page_size = self._adaptive_page_size
+        partially_filtered._accessed_by = self._accessed_by
         return partially_filtered
 
     def filter(self, **kwargs):
@@ -56,6 +72,7 @@ class PartiallyFiltered(object):
         """
         partially_filtered = self._copy()
         partially_filtered.params.update(kwargs)
+        self._derive_results(partially_filtered, kwargs)
         return partially_filtered
 
     def exclude(self, **kwargs):
@@ -82,6 +99,8 @@ class PartiallyFiltered(object):
         """
         Similar to the Django ORM's QuerySet.all
         """
+        if self._is_manager_queryset:
+            return self._copy()
         return self
 
     def none(self):
@@ -112,7 +131,10 @@ class PartiallyFiltered(object):
             url = self.model._resources_url()
             params['limit'] = 1
             json_ = self.model._rest_call(url, params=params)
-            count = json_['count']
+            count = json_.get('count')
+            if count is None:
+                # e.g. CursorPagination doesn't report the count and ignores the limit
+                count = len(json_['results']) + (1 if json_['next'] else 0)
             if count == 0:
                 raise self.model.DoesNotExist(
                     "%s matching query does not exist." % self.model.__name__
@@ -139,6 +161,9 @@ class PartiallyFiltered(object):
         """
         Similar to the Django ORM's QuerySet.first
         """
+        results = self._materialized_results()
+        if results is not None:
+            return results[0] if results else None
         try:
             return self.filter(limit=1)[0]
         except IndexError:
@@ -156,6 +181,9 @@ class PartiallyFiltered(object):
             if ordering_field.startswith('-'):
                 return ordering_field[1:]
             return '-%s' % ordering_field
+        results = self._materialized_results()
+        if results is not None:
+            return results[-1] if results else None
         ordering = ','.join(
             [inverse(ordering_field) for ordering_field in
              self.params.get('ordering', self.model._primary_key()).split(',')]
@@ -189,19 +217,208 @@ class PartiallyFiltered(object):
     def exists(self):
         """
         Similar to the Django ORM's QuerySet.exists
+
+        No instances are created, see also count.
         """
-        return bool(self.filter(limit=1).first())
+        results = self._materialized_results()
+        if results is not None:
+            return bool(results)
+        # The count of all results ignores the offset and the limit of a sliced queryset
+        sliced = 'offset' in self.params or 'limit' in self.params
+        if getattr(self, '_fetched_count', None) is not None and not sliced:
+            return self._fetched_count > 0
+        params = self._preprocess_filter_params(self.params)
+        # DRF's LimitOffsetPagination ignores limit=0
+        if params.get('__none__') or params.get('limit') == 0:
+            return False
+        if self.model._pagination_options()['MODE'] == 'cursor':
+            # The pages are only walked through up to the offset of a sliced queryset
+            params, start, stop = self._client_side_slice(params)
+            fetched = 0
+            for json_ in self._iter_pages(params):
+                fetched += len(json_['results'])
+                if fetched > start:
+                    return True
+            return False
+        if self.model._count_options()['MODE'] != 'limit' and not sliced:
+            return self._fetch_count(params) > 0
+        params['limit'] = 1
+        json_ = self.model._rest_call(self.model._resources_url(), params=params)
+        return bool(json_['results'])
 
     def count(self):
         """
         Similar to the Django ORM's QuerySet.count
-        """
-        url = self.model._resources_url()
+
+        The results are counted locally if all of them have already been fetched unless the queryset is sliced
+        (the server reports the count regardless of slicing) in which case the count of the first page is reused.
+        Otherwise the way of counting is set by Meta.count or settings.REST_FRAMEWORK_CLIENT['COUNT'],
+        see Model._count_options.
+        """
+        if 'limit' not in self.params and 'offset' not in self.params:
+            results = self._materialized_results()
+            if results is not None:
+                return len(results)
+        if getattr(self, '_fetched_count', None) is not None:
+            return self._fetched_count
         params = self._preprocess_filter_params(self.params)
-        params['limit'] = 1
+        if params.get('__none__'):
+            return 0
+        return self._fetch_count(params)
+
+    def _fetch_count(self, params):
+        options = self.model._count_options()
+        url = self.model._resources_url()
+        mode = options['MODE']
+        if mode == 'head':
+            headers = self.model._rest_call(url, method='HEAD', params=dict(params, limit=1))
+            if headers and headers.get(options['HEADER']) is not None:
+                return int(headers[options['HEADER']])
+            # The server doesn't send the header, count the usual way
+            mode = 'limit'
+        if mode == 'param':
+            params = dict(params, **{options['PARAM']: 1})
+        elif self.model._pagination_options()['MODE'] == 'cursor':
+            # The pages of CursorPagination don't report the count, they have to be walked through
+            params = {k: v for k, v in params.items() if k not in ('limit', 'offset')}
+            return sum(len(json_['results']) for json_ in self._iter_pages(params))
+        else:
+            params = dict(params, limit=0 if mode == 'limit_zero' else 1)
         json_ = self.model._rest_call(url, params=params)
         return json_['count']
 
+    def aget(self, **kwargs):
+        """
+        Like get but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.get, **kwargs)
+
+    def afirst(self):
+        """
+        Like first but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.first)
+
+    def aexists(self):
+        """
+        Like exists but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.exists)
+
+    def acount(self):
+        """
+        Like count but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.count)
+
+    def aiterator(self, pages_ahead=4):
+        """
+        Iterates over the results without caching them while fetching up to `pages_ahead` pages
+        concurrently on the thread pool.
+
+        The URLs of the pages are derived from the `count` and the `next` URL of the first page
+        when the server uses LimitOffsetPagination, otherwise just the next page is fetched ahead.
+        """
+        params = self._preprocess_filter_params(self.params)
+        if params.get('__none__'):
+            return
+        if not self._can_fetch_pages_concurrently(params):
+            for obj in self.iterator():
+                yield obj
+            return
+        for json_ in self._iter_pages_concurrently(params, pages_ahead):
+            for result in json_['results']:
+                yield self._instance(result)
+
+    def iterator(self):
+        """
+        Similar to the Django ORM's QuerySet.iterator
+
+        Iterates over the results without caching them.
+        """
+        params = self._preprocess_filter_params(self.params)
+        if params.get('__none__'):
+            return iter([])
+        return self._iter_results(params)
+
+    def export(self, fileobj, format='jsonl', fields=None, pages_ahead=0):
+        """
+        Writes the results to fileobj as JSON Lines or CSV page by page as they are received,
+        without creating the instances or keeping the results in memory, see restframeworkclient.exporting
+
+        :param format: 'jsonl' or 'csv'
+        :param fields: the names of the fields to write, by default all attributes received
+        :param pages_ahead: the number of pages to fetch concurrently ahead like aiterator does, 0 to fetch them one by one
+        :return: the number of results written
+        """
+        params = self._preprocess_filter_params(self.params)
+        if params.get('__none__'):
+            pages = []
+        elif pages_ahead and self._can_fetch_pages_concurrently(params):
+            pages = (json_['results'] for json_ in self._iter_pages_concurrently(params, pages_ahead))
+        else:
+            pages = self._iter_result_pages(params)
+        return exporting.export_pages(self.model, pages, fileobj, format=format, fields=fields)
+
+    def _can_fetch_pages_concurrently(self, params):
+        mode = self.model._pagination_options()['MODE']
+        # Unless each page depends on the previous one or the results are sliced on the client
+        return mode != 'keyset' and not (mode == 'cursor' and ('limit' in params or 'offset' in params))
+
+    def to_columns(self, *fields, **kwargs):
+        """
+        Returns an OrderedDict mapping the field names to the columns of their values of all results
+        without creating the instances, e.g. for analytics on many results.
+
+        The columns are NumPy arrays if NumPy is installed, otherwise array.array instances of numbers
+        or lists, see restframeworkclient.columns. The values of DateTimeField, DateField and TimeField are
+        datetime64 and timedelta64 values in UTC or numbers of seconds, days and seconds since midnight
+        without NumPy. The other columns are of objects unless their dtype is given.
+
+        :param dtypes: dict mapping field names to NumPy dtypes, e.g. {'amount': 'float64'}
+        """
+        dtypes = kwargs.pop('dtypes', None)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: %s' % ', '.join(kwargs))
+        builder = columns.ColumnsBuilder(self.model, fields, dtypes)
+        results = self._materialized_results()
+        if results is not None:
+            builder.extend([obj._attrs for obj in results])
+            return builder.finish()
+        params = self._preprocess_filter_params(self.params)
+        if not params.get('__none__'):
+            for page in self._iter_result_pages(params, reserve=builder.reserve):
+                builder.extend(page)
+        return builder.finish()
+
+    def _iter_pages_concurrently(self, params, pages_ahead):
+        url = self.model._resources_url()
+        page_size = self._get_page_size()
+        if page_size and 'limit' not in params:
+            json_ = self.model._rest_call(url, params=dict(params, limit=page_size))
+        else:
+            json_ = self.model._rest_call(url, params=params)
+        yield json_
+        if not json_['next'] or 'limit' in params:
+            return
+
+        page_urls = offset_page_urls(json_['next'], json_.get('count'))
+        if page_urls is None:
+            future = concurrency.submit(self.model._rest_call, json_['next'])
+            while future is not None:
+                json_ = future.result()
+                future = concurrency.submit(self.model._rest_call, json_['next']) if json_['next'] else None
+                yield json_
+            return
+
+        futures = collections.deque()
+        for page_url in page_urls:
+            futures.append(concurrency.submit(self.model._rest_call, page_url))
+            if len(futures) >= pages_ahead:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
     def new(self, **kwargs):
         params = self.params.copy()
         params.update(kwargs)
@@ -220,6 +437,45 @@ class PartiallyFiltered(object):
         obj._attrs.update(params)
         return obj.save()
 
+    def bulk_create(self, objs, batch_size=None, max_workers=bulk.DEFAULT_MAX_WORKERS):
+        """
+        Similar to the Django ORM's QuerySet.bulk_create
+
+        Uses the server-side bulk endpoint if the model declares one in Meta.bulk_endpoint
+        accepting a list of objects in batches of batch_size (all at once by default),
+        otherwise creates the objects one by one with at most max_workers requests in parallel.
+        The primary keys are populated on the created instances.
+
+        :return: a list of BulkItemResult with the errors of the instances that were not created
+        """
+        return bulk.bulk_create(self.model, objs, batch_size=batch_size, max_workers=max_workers)
+
+    def bulk_update(self, objs, fields, batch_size=None, max_workers=bulk.DEFAULT_MAX_WORKERS):
+        """
+        Similar to the Django ORM's QuerySet.bulk_update, see bulk_create
+        """
+        return bulk.bulk_update(self.model, objs, fields, batch_size=batch_size, max_workers=max_workers)
+
+    def update(self, **kwargs):
+        """
+        Similar to the Django ORM's QuerySet.update, see bulk_create
+
+        The matching instances are fetched first as the server is expected to update instances by primary keys only.
+        """
+        return bulk.update(self.model, self, kwargs)
+
+    def delete(self):
+        """
+        Similar to the Django ORM's QuerySet.delete, see bulk_create
+
+        The matching instances are fetched first as the server is expected to delete instances by primary keys only.
+        """
+        # Like the Django ORM's Manager, `Model.objects` doesn't delete all instances at once by mistake
+        if self._is_manager_queryset:
+            raise AttributeError("'%s.objects' has no attribute 'delete', use '%s.objects.all().delete()' to delete "
+                                 "all instances" % (self.model.__name__, self.model.__name__))
+        return bulk.bulk_delete(self.model, self)
+
     def order_by(self, *fields):
         """
         Similar to the Django ORM's QuerySet.order_by
@@ -230,6 +486,20 @@ class PartiallyFiltered(object):
         """
         partially_filtered = self._copy()
         partially_filtered.params['ordering'] = ','.join(fields)
+        self._derive_results(partially_filtered, {'ordering': partially_filtered.params['ordering']})
+        return partially_filtered
+
+    def page_size(self, size=None, adaptive=False):
+        """
+        Sets the number of results fetched per page (the limit param) without limiting the number of results,
+        overriding Meta.page_size of the model. Without it the server's default page size is used.
+
+        :param adaptive: if True, the page size starts at `size` and then changes to make fetching each page
+         take about the target time, see Model._adaptive_page_size_options
+        """
+        partially_filtered = self._copy()
+        partially_filtered._page_size = size
+        partially_filtered._adaptive_page_size = adaptive
         return partially_filtered
 
     def select_related(self, *fields):
@@ -242,16 +512,32 @@ class PartiallyFiltered(object):
         partially_filtered.params['select_related'] = ','.join(fields)
         return partially_filtered
 
-    def prefetch_related(self, *fields):
+    def prefetch_related(self, *fields, **kwargs):
         """
         Similar to the Django ORM's QuerySet.select_related
 
         Currently it doesn't support Prefetch objects nor chaining syntax with `__`.
+
+        :param eager: if True, all the related instances are fetched concurrently as soon as the results
+         are evaluated instead of one relation after another the first time each of them is accessed
         """
         partially_filtered = self._copy()
-        partially_filtered._prefetch_related.extend(fields)
+        partially_filtered._prefetch_related = self._prefetch_related + list(fields)
+        if kwargs.get('eager'):
+            partially_filtered._prefetch_related_eagerly = True
         return partially_filtered
 
+    def _prefetch_related_concurrently(self):
+        instances = list(self._results())
+        futures = [concurrency.submit(self._prefetch_related_field, field_name, instances)
+                   for field_name in self._prefetch_related]
+        concurrency.wait(futures)
+
+    def _prefetch_related_field(self, field_name, instances):
+        descriptor = getattr(self.model, field_name)
+        # Evaluates the prefetched results in case they are lazy such as the PartiallyFiltered of ReverseReference
+        list(descriptor._prefetch(self, instances))
+
     def _preprocess_filter_params(self, params):
         from restframeworkclient.models import Model
 
@@ -279,33 +565,205 @@ class PartiallyFiltered(object):
         kwargs = self._preprocess_filter_params(kwargs)
         if kwargs.get('__none__'):
             return []
-        url = self.model._resources_url()
-        json_ = self.model._rest_call(url, params=kwargs)
-        def generator(json_):
-            while True:
-                for result in json_['results']:
-                    obj = self.model(**result)
-                    obj._persisted = True
-                    obj._partially_filtered = self
-                    yield obj
-                if not json_['next']:
-                    break
-                json_ = self.model._rest_call(json_['next'])
-        results = Indexable(generator(json_))
+        results = Indexable(self._iter_results(kwargs))
         if 'limit' in kwargs:
             # Effectively ignores any next pages
             results = results[:kwargs['limit']]
         return results
 
+    def _iter_results(self, params):
+        """
+        Returns an iterator of the instances of all pages fetching the first page right away.
+
+        Unless the server uses LimitOffsetPagination (see Model._pagination_options) the limit and offset params
+        are applied here by skipping the results instead of sending them to the server.
+
+        If enabled by Model._streaming_options, the instances are created while the pages are being received.
+        """
+        params, start, stop = self._client_side_slice(params)
+        pages = self._iter_pages(params, stop, stream=self.model._streaming_options() is not None)
+        json_ = next(pages)
+        self._fetched_count = json_.get('count')
+
+        parsed_fields = self.model._eagerly_parsed_fields()
+
+        def generator(json_):
+            while json_ is not None:
+                if parsed_fields and not isinstance(json_, streaming.StreamedPage):
+                    instances = [self._instance(result) for result in json_['results']]
+                    for field in parsed_fields:
+                        field.parse_column(instances)
+                    for obj in instances:
+                        yield obj
+                else:
+                    for result in json_['results']:
+                        yield self._instance(result)
+                json_ = next(pages, None)
+        return itertools.islice(generator(json_), start, stop)
+
+    def _iter_result_pages(self, params, reserve=None):
+        """
+        Like _iter_results but yields the list of the results of each page as received instead of the instances
+
+        :param reserve: called with the number of results to be yielded once it is known from the first page
+        """
+        params, start, stop = self._client_side_slice(params)
+        position = 0
+        pages = self._iter_pages(params, stop, stream=self.model._streaming_options() is not None)
+        for i, json_ in enumerate(pages):
+            if i == 0:
+                self._fetched_count = json_.get('count')
+                if reserve is not None and self._fetched_count is not None:
+                    reserve(max(min_ignoring_nones(self._fetched_count - params.get('offset', 0), stop) - start, 0))
+            results = list(json_['results'])
+            page_start = position
+            position += len(results)
+            results = results[max(start - page_start, 0):stop - page_start if stop is not None else None]
+            if results:
+                yield results
+            if stop is not None and position >= stop:
+                return
+
+    def _client_side_slice(self, params):
+        """
+        Returns the params to be sent to the server together with the start and stop of the results to be returned
+        out of all results received
+        """
+        if self.model._pagination_options()['MODE'] == 'offset':
+            return params, 0, params.get('limit')
+        params = params.copy()
+        start = params.pop('offset', 0)
+        stop = start + params.pop('limit') if 'limit' in params else None
+        return params, start, stop
+
+    def _iter_pages(self, params, stop=None, stream=False):
+        """
+        Yields the JSON of the pages following the next links or, in the keyset mode, filtering by the last value
+        of the ordering field.
+
+        :param stop: the number of results needed if known, to limit the size of the keyset pages
+        :param stream: whether to yield restframeworkclient.streaming.StreamedPage instances for pages received
+         over HTTP, each page's results have to be iterated over before the next page is fetched
+        """
+        url = self.model._resources_url()
+        options = self.model._pagination_options()
+        page_size = self._get_page_size()
+        adaptive = self._get_adaptive_page_size(page_size)
+        if adaptive is not None:
+            page_size = adaptive.size
+        ordering = params.get('ordering', self.model._primary_key())
+        if options['MODE'] == 'keyset' and ',' not in ordering:
+            # Filtering by ordering > last value is fast on the server unlike big offsets
+            page_size = page_size or options['PAGE_SIZE']
+            field_name = ordering.lstrip('-')
+            lookup = '%s__%s' % (field_name, 'lt' if ordering.startswith('-') else 'gt')
+            params = dict(params, ordering=ordering, limit=min_ignoring_nones(page_size, stop))
+            while True:
+                json_ = self._fetch_page(url, params, adaptive, stream)
+                yield json_
+                last_result = streaming.last_result(json_)
+                if last_result is None or not json_['next']:
+                    return
+                params = dict(params, **{lookup: last_result[field_name]})
+                params['limit'] = adaptive.size if adaptive is not None else page_size
+
+        if page_size and options['MODE'] == 'offset':
+            params = dict(params, limit=min_ignoring_nones(page_size, params.get('limit')))
+        json_ = self._fetch_page(url, params, adaptive, stream)
+        yield json_
+        while json_['next']:
+            next_url = json_['next']
+            if adaptive is not None and options['MODE'] == 'offset':
+                next_url = extend_url_query_string(next_url, {'limit': adaptive.size})
+            json_ = self._fetch_page(next_url, None, adaptive, stream)
+            yield json_
+
+    def _fetch_page(self, url, params, adaptive=None, stream=False):
+        from restframeworkclient.models import last_response_size
+        kwargs = {'stream': True} if stream else {}
+        start = time.time()
+        if params is None:
+            json_ = self.model._rest_call(url, **kwargs)
+        else:
+            json_ = self.model._rest_call(url, params=params, **kwargs)
+        if adaptive is not None:
+            elapsed = time.time() - start
+            if isinstance(json_, streaming.StreamedPage):
+                # The page is measured once it has been received
+                json_.on_finish = lambda page: adaptive.update(page.result_count, elapsed + page.elapsed, page.size)
+            else:
+                adaptive.update(len(json_['results']), elapsed, last_response_size())
+        return json_
+
+    def _get_page_size(self):
+        return self._page_size or getattr(self.model.Meta, 'page_size', None)
+
+    def _get_adaptive_page_size(self, page_size):
+        """
+        Returns the AdaptivePageSize to be updated after each page if the adaptive page size is enabled
+        by page_size(adaptive=True), Meta.adaptive_page_size or settings.REST_FRAMEWORK_CLIENT['ADAPTIVE_PAGE_SIZE']
+        """
+        options = self.model._adaptive_page_size_options(force=self._adaptive_page_size)
+        if options is None:
+            return None
+        return AdaptivePageSize(page_size or options['INITIAL_SIZE'], target_time=options['TARGET_TIME'],
+                                min_size=options['MIN_SIZE'], max_size=options['MAX_SIZE'],
+                                max_bytes=options['MAX_BYTES'])
+
+    def _instance(self, result):
+        obj = self.model(**result)
+        obj._persisted = True
+        obj._partially_filtered = self
+        return obj
+
     def _results(self):
         """
-        Don't access self._cached_results from any other place
+        Don't access self._cached_results from any other place than here, _materialized_results and _set_results
         in order for this class to remain flexible in regard to working with underlying data by overriding it in subclasses
         """
         if not hasattr(self, '_cached_results'):
-            self._cached_results = self._fetch_results(**self.params)
+            with querylog.accessing(self._accessed_by):
+                self._cached_results = self._fetch_results(**self.params)
+            if self._prefetch_related_eagerly and self._prefetch_related:
+                self._prefetch_related_concurrently()
+        return self._cached_results
+
+    def _materialized_results(self):
+        """
+        Returns the list of all results if they have already been fetched, None otherwise
+        """
+        if not hasattr(self, '_cached_results'):
+            return None
+        if isinstance(self._cached_results, Indexable):
+            return self._cached_results.already_computed if self._cached_results.exhausted else None
         return self._cached_results
 
+    def _derive_results(self, partially_filtered, params):
+        """
+        Filters and orders the results of this queryset by params for partially_filtered derived from it
+        instead of fetching its results from the server if all results are in memory and the params are supported,
+        see restframeworkclient.lookups
+        """
+        if 'limit' in self.params or 'offset' in self.params:
+            return
+        params = self._preprocess_filter_params(dict(params))
+        # Getting the results may fetch them, e.g. the prefetched results of a ReverseReference
+        if not lookups.supports(self.model, params):
+            return
+        results = self._materialized_results()
+        if results is None:
+            return
+        results = lookups.evaluate(self.model, results, params)
+        if results is not None:
+            partially_filtered._set_results(results)
+
+    def _set_results(self, results, count=None):
+        """
+        Provides the results derived from the results of another queryset instead of fetching them
+        """
+        self._cached_results = results
+        self._fetched_count = count
+
     def __getitem__(self, index):
         """
         The server side must have rest_framework.pagination.LimitOffsetPagination enabled
@@ -314,6 +772,7 @@ class PartiallyFiltered(object):
         previous_offset = self.params.get('offset', 0)
         previous_limit = self.params.get('limit', None)
         params = {}
+        results = self._materialized_results()
         try:
             start = index.start or 0
             offset = previous_offset + start
@@ -325,11 +784,19 @@ class PartiallyFiltered(object):
                 limit -= start
                 params['limit'] = limit
 
+            if results is not None:
+                if index.step and index.step > 1:
+                    return results[index]
+                partially_filtered = self.filter(**params)
+                partially_filtered._set_results(results[index], getattr(self, '_fetched_count', None))
+                return partially_filtered
             if index.step and index.step > 1:
                 results = self.filter(**params)._results()
                 return results.__getitem__(slice(0, limit, index.step))
             return self.filter(**params)
         except AttributeError:
+            if results is not None:
+                return results[index] if index < len(results) else None
             offset = previous_offset + index
             if offset != 0:
                 params['offset'] = offset
@@ -0,0 +1,191 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import sys
+import time
+import threading
+
+import six
+from six.moves import queue
+
+stats = {
+    'requests': 0,
+    'hedges_sent': 0,
+    'hedges_won': 0,
+}
+_stats_lock = threading.Lock()
+
+
+# The number of idle worker threads kept for the next hedged calls
+MAX_IDLE_WORKERS = 32
+
+_idle_workers = []
+_workers_lock = threading.Lock()
+
+# Put in the queue of the outcomes of a hedged call once the hedge is due, see hedged_call
+_SEND_HEDGE = object()
+
+
+def reset_stats():
+    """
+    Resets the hedging counters, e.g. at the beginning of a test or a measurement period.
+    """
+    with _stats_lock:
+        for key in stats:
+            stats[key] = 0
+
+
+def _reserve_hedge(max_rate):
+    """
+    Counts a hedge as sent unless it would make hedges exceed max_rate of all hedged requests.
+    """
+    with _stats_lock:
+        if stats['hedges_sent'] + 1 > max_rate * stats['requests']:
+            return False
+        stats['hedges_sent'] += 1
+        return True
+
+
+def _release_hedge():
+    """
+    Takes back a hedge reserved by _reserve_hedge which wasn't sent after all.
+    """
+    with _stats_lock:
+        stats['hedges_sent'] -= 1
+
+
+class _Worker(threading.Thread):
+    """
+    A daemon thread running the calls given to it one after another and waiting among the idle workers in between
+    """
+    def __init__(self):
+        super(_Worker, self).__init__()
+        self.daemon = True
+        self.tasks = queue.Queue()
+
+    def run(self):
+        while True:
+            self.tasks.get()()
+            with _workers_lock:
+                if len(_idle_workers) >= MAX_IDLE_WORKERS:
+                    return
+                _idle_workers.append(self)
+
+
+def _run_on_worker(task):
+    """
+    Runs task on an idle worker thread, starting a new worker only if there is none
+    """
+    with _workers_lock:
+        worker = _idle_workers.pop() if _idle_workers else None
+    if worker is None:
+        worker = _Worker()
+        worker.start()
+    worker.tasks.put(task)
+
+
+def hedged_call(send, delay, max_rate, may_hedge=None, discard=None):
+    """
+    Calls send() and if it doesn't return within delay seconds calls send() once more in parallel.
+    The outcome of whichever call finishes first is returned (or raised).
+    A failed call only wins if there is no other call still in flight.
+
+    The calls run on worker threads reused by the following hedged calls. Another worker sleeps for delay
+    and then asks for the hedge so that the outcome is waited for without a timeout, which polls on Python 2.
+
+    :param send: callable without arguments performing one idempotent request
+    :param delay: seconds to wait for the first call before sending the hedge, ideally around the p95 latency
+    :param max_rate: maximal ratio of hedges sent to hedged requests, e.g. 0.05 allows at most 5% extra requests
+    :param may_hedge: optional callable consulted right before sending the hedge, returning False skips the hedge
+    :param discard: optional callable called with the result of the losing call once it arrives,
+     e.g. closing the response to release its connection
+    """
+    outcomes = queue.Queue()
+    lock = threading.Lock()
+    decided = []
+
+    def discard_outcome(outcome):
+        if discard is not None and outcome is not _SEND_HEDGE and outcome[2] is None:
+            try:
+                discard(outcome[1])
+            except Exception:
+                pass
+
+    def task(is_hedge):
+        def run():
+            try:
+                outcome = (is_hedge, send(), None)
+            except Exception:
+                outcome = (is_hedge, None, sys.exc_info())
+            with lock:
+                if not decided:
+                    outcomes.put(outcome)
+                    return
+            discard_outcome(outcome)
+        return run
+
+    def timer():
+        time.sleep(delay)
+        with lock:
+            if not decided:
+                outcomes.put(_SEND_HEDGE)
+
+    with _stats_lock:
+        stats['requests'] += 1
+    _run_on_worker(task(False))
+    _run_on_worker(timer)
+    in_flight = 1
+    while True:
+        outcome = outcomes.get()
+        if outcome is _SEND_HEDGE:
+            # The rate cap is checked first as may_hedge may consume a budget, e.g. of the rate limits
+            if _reserve_hedge(max_rate):
+                if may_hedge is None or may_hedge():
+                    _run_on_worker(task(True))
+                    in_flight += 1
+                else:
+                    _release_hedge()
+            continue
+        in_flight -= 1
+        # A failed call only wins if there is no other call still in flight
+        if outcome[2] is None or not in_flight:
+            break
+
+    with lock:
+        decided.append(True)
+        losers = []
+        while not outcomes.empty():
+            losers.append(outcomes.get())
+    for loser in losers:
+        discard_outcome(loser)
+
+    is_hedge, result, exc_info = outcome
+    if exc_info is not None:
+        six.reraise(*exc_info)
+    if is_hedge:
+        with _stats_lock:
+            stats['hedges_won'] += 1
+    return result
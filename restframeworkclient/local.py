@@ -0,0 +1,160 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+from django.conf import settings
+from django.http.response import HttpResponseNotFound
+from django.test.client import RequestFactory, MULTIPART_CONTENT, BOUNDARY, encode_multipart
+from django.utils.http import urlencode
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from restframeworkclient import jsoncodecs
+
+try:
+    from django.urls import resolve, get_urlconf, Resolver404
+except ImportError:  # Django < 1.10
+    from django.core.urlresolvers import resolve, get_urlconf, Resolver404
+
+_request_factory = RequestFactory()
+
+# Maps (urlconf, path) to the resolved view, bounded by RESOLVED_PATHS_CACHE_SIZE
+_resolved_paths = {}
+RESOLVED_PATHS_CACHE_SIZE = 10000
+
+# The BASE_URLS setting the lookup table was compiled from together with the table itself
+_compiled_base_urls = (None, None)
+
+
+def _compile_base_urls(base_urls):
+    """
+    Builds a dict of base URLs without trailing slashes mapping to their URL prefixes
+    together with the base URLs ordered from the longest for the fallback lookup.
+    """
+    prefixes = {api_baseurl.rstrip('/'): api for api, api_baseurl in base_urls.items()}
+    ordered = sorted(prefixes.items(), key=lambda item: len(item[0]), reverse=True)
+    return prefixes, ordered
+
+
+def get_api_prefix(url):
+    """
+    Returns the key of settings.REST_FRAMEWORK_CLIENT['BASE_URLS'] whose base URL is the longest prefix of url
+    or None if there is no such base URL.
+
+    The table is compiled once per BASE_URLS dict and looked up by cutting the url at each slash
+    so the cost depends on the depth of the url instead of the number of base URLs.
+    """
+    global _compiled_base_urls
+    base_urls = settings.REST_FRAMEWORK_CLIENT.get('BASE_URLS') or {}
+    compiled_from, compiled = _compiled_base_urls
+    if compiled_from is not base_urls:
+        compiled = _compile_base_urls(base_urls)
+        _compiled_base_urls = (base_urls, compiled)
+    prefixes, ordered = compiled
+
+    found, found_length = None, 0
+    end = len(url)
+    while end > 0:
+        api = prefixes.get(url[:end])
+        if api is not None:
+            found, found_length = api, end
+            break
+        end = url.rfind('/', 0, end)
+
+    # Longer base URLs not ending at a slash boundary of the url, e.g. 'http://example.org/v' for 'http://example.org/v1/'
+    for api_baseurl, api in ordered:
+        if len(api_baseurl) <= found_length:
+            break
+        if url.startswith(api_baseurl):
+            return api
+    return found
+
+
+def _resolve(path):
+    key = (get_urlconf() or settings.ROOT_URLCONF, path)
+    match = _resolved_paths.get(key)
+    if match is None:
+        match = resolve(path)
+        if len(_resolved_paths) >= RESOLVED_PATHS_CACHE_SIZE:
+            _resolved_paths.clear()
+        _resolved_paths[key] = match
+    return match
+
+
+def _build_request(method, path, query_string, data, json_data=None):
+    """
+    Builds the same kind of request as APIClient would do but with form-urlencoded data
+    which is cheaper to encode and parse than multipart unless files are being uploaded.
+    """
+    if json_data is not None:
+        body, content_type = jsoncodecs.get_codec().dumps(json_data), 'application/json'
+    elif not data:
+        body, content_type = '', 'application/octet-stream'
+    elif any(hasattr(value, 'read') for value in data.values()):
+        body, content_type = encode_multipart(BOUNDARY, data), MULTIPART_CONTENT
+    else:
+        body, content_type = urlencode(data, doseq=True), 'application/x-www-form-urlencoded'
+    request = _request_factory.generic(method.upper(), path, body, content_type, QUERY_STRING=query_string)
+    request._dont_enforce_csrf_checks = True
+    return request
+
+
+def dispatch(method, path, query_string, data, json_data=None):
+    """
+    Calls the REST Framework view serving path directly instead of going through the Django test client.
+
+    This skips the middleware, the request signals and the response rendering.
+    The view is resolved only once per path.
+
+    :param json_data: if not None, it is sent as the JSON body instead of the form data
+    :return: the unrendered response of the view with the serialized data in response.data
+     or HttpResponseNotFound if there is no view for path
+    """
+    try:
+        match = _resolve(path)
+    except Resolver404:
+        return HttpResponseNotFound()
+    request = _build_request(method, path, query_string, data, json_data)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+class BatchView(APIView):
+    """
+    Local stand-in of a batch endpoint, see restframeworkclient.batching, e.g. for tests:
+
+        urlpatterns += [url(r'^example-org-v1/batch/$', BatchView.as_view())]
+
+    It accepts a JSON list of calls `{"method": ..., "url": ..., "data" or "json": ...}` with urls relative
+    to the parent of its own path and returns the list of their results `{"status": ..., "body": ...}`.
+    The calls are dispatched to the views of the same urlconf one by one.
+    """
+    def post(self, request):
+        base_path = request.path[:request.path.rstrip('/').rfind('/') + 1]
+        results = []
+        for item in request.data:
+            path, _, query_string = item['url'].partition('?')
+            response = dispatch(item['method'], base_path + path, query_string, item.get('data'), item.get('json'))
+            results.append({'status': response.status_code, 'body': getattr(response, 'data', None)})
+        return Response(results)
@@ -0,0 +1,184 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import decimal
+import operator
+
+import six
+
+
+def _isnull(value, isnull):
+    if isinstance(isnull, six.string_types):
+        isnull = isnull.lower() in ('true', '1')
+    return (value is None) == bool(isnull)
+
+
+def _icontains(value, substring):
+    return value is not None and six.text_type(substring).lower() in six.text_type(value).lower()
+
+
+def _compare(compare):
+    def lookup(value, other):
+        return value is not None and other is not None and compare(value, _coerce(other, value))
+    return lookup
+
+
+def _exact(value, other):
+    return value == _coerce(other, value)
+
+
+def _in(value, others):
+    return any(value == _coerce(other, value) for other in others)
+
+
+LOOKUPS = {
+    'exact': _exact,
+    'in': _in,
+    'gt': _compare(operator.gt),
+    'gte': _compare(operator.ge),
+    'lt': _compare(operator.lt),
+    'lte': _compare(operator.le),
+    'isnull': _isnull,
+    'icontains': _icontains,
+}
+
+
+def _coerce(value, like):
+    """
+    Converts a string filter value to the type of the attribute value like the server would parse it
+    """
+    if not isinstance(value, six.string_types) or isinstance(like, six.string_types) or like is None:
+        return value
+    try:
+        if isinstance(like, bool):
+            return value.lower() in ('true', '1')
+        if isinstance(like, six.integer_types + (float, decimal.Decimal)):
+            return type(like)(value)
+    except (ValueError, decimal.InvalidOperation):
+        pass
+    return value
+
+
+def _get_field(model, name):
+    """
+    Returns the function converting filter values to the type of the field together with the function returning
+    the converted value of an instance or None if `name` isn't a declared field
+    """
+    from restframeworkclient import fields
+    if name in ('pk', model._primary_key()):
+        pk = model._primary_key()
+        return lambda value: value, lambda obj: obj._attrs.get(pk)
+    field = getattr(model, name, None)
+    if isinstance(field, fields.Field) and not isinstance(field, (fields.ReverseReference, fields.FileField)):
+        return field.to_python, field.python_value
+    return None
+
+
+def _parse_filter(model, key, value):
+    if '__' in key:
+        name, lookup_name = key.rsplit('__', 1)
+    else:
+        name, lookup_name = key, 'exact'
+    field = _get_field(model, name)
+    if field is None or lookup_name not in LOOKUPS:
+        return None
+    to_python, get_value = field
+    if lookup_name == 'in':
+        if isinstance(value, six.string_types):
+            value = value.split(',')
+        value = [to_python(item) for item in value]
+    elif lookup_name not in ('isnull', 'icontains'):
+        value = to_python(value)
+    return get_value, LOOKUPS[lookup_name], value
+
+
+def _parse_ordering(model, ordering):
+    keys = []
+    for name in ordering.split(','):
+        descending = name.startswith('-')
+        field = _get_field(model, name.lstrip('-'))
+        if field is None:
+            return None
+        keys.append(field + (descending,))
+    return keys
+
+
+def _null_last_key(value):
+    return value is None, value
+
+
+def _parse_params(model, params):
+    """
+    Returns the parsed filters and ordering of params or None if any of the params is not supported
+    """
+    filters = []
+    ordering = None
+    for key, value in params.items():
+        if key == 'ordering':
+            ordering = _parse_ordering(model, value)
+            if ordering is None:
+                return None
+        else:
+            parsed = _parse_filter(model, key, value)
+            if parsed is None:
+                return None
+            filters.append(parsed)
+    return filters, ordering
+
+
+def supports(model, params):
+    """
+    Returns whether evaluate supports all params, to be checked before fetching the results to be evaluated
+    """
+    return bool(params.get('__none__')) or _parse_params(model, params) is not None
+
+
+def evaluate(model, results, params):
+    """
+    Applies filter params and the `ordering` param to the list of model instances the way the server would.
+
+    Supported are the lookups exact, in, gt, gte, lt, lte, isnull and icontains of the declared fields
+    and the primary key.
+
+    :return: a new list of instances or None if any of the params is not supported
+    """
+    if params.get('__none__'):
+        return []
+    parsed = _parse_params(model, params)
+    if parsed is None:
+        return None
+    filters, ordering = parsed
+
+    try:
+        results = [obj for obj in results if all(lookup(get_value(obj), value) for get_value, lookup, value in filters)]
+        for _, get_value, descending in reversed(ordering or []):
+            # Like PostgreSQL None (NULL) goes last in the ascending order and first in the descending order
+            results = sorted(results, key=lambda obj, get_value=get_value: _null_last_key(get_value(obj)),
+                             reverse=descending)
+    except TypeError:
+        # e.g. comparing naive and aware datetimes
+        return None
+    return results
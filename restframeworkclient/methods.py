@@ -24,12 +24,6 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
-import datetime
-import json
-
-from django.core.serializers.json import DjangoJSONEncoder
-from django.utils import timezone
-
 from restframeworkclient.fields import ModelPropertyMixin
 
 
@@ -47,26 +41,17 @@ class Method(ModelPropertyMixin, object):
         self.unwrapping_key = unwrapping_key
 
     def __get__(self, instance, owner):
-        from restframeworkclient.models import Model
-
         def callable(**kwargs):
-            def get_value(value):
-                if isinstance(value, dict):
-                    return json.dumps(value, cls=DjangoJSONEncoder)
-                if value in (datetime.datetime.now, timezone.now):
-                    return value()
-                if isinstance(value, Model):
-                    return value.pk
-                return value
-
-            kwargs = {k: get_value(v) for k, v in kwargs.items()}
-            arg_name = 'data' if self.method == 'POST' else 'params'
+            if self.method == 'POST':
+                request_kwargs = owner._body_kwargs(kwargs)
+            else:
+                request_kwargs = {'params': owner._postprocess_data(kwargs)}
             if self.static:
                 url = owner._resources_url() + self.subresource + '/'
-                data = owner._rest_call(url, method=self.method, **{arg_name: kwargs})
+                data = owner._rest_call(url, method=self.method, **request_kwargs)
             else:
                 url = instance._resource_url(instance.pk) + self.subresource + '/'
-                data = instance._rest_call(url, method=self.method, **{arg_name: kwargs})
+                data = instance._rest_call(url, method=self.method, **request_kwargs)
             if self.unwrapping_key:
                 data = data[self.unwrapping_key]
             if self.model:
@@ -105,13 +90,14 @@ class MethodReturningCollection(ModelPropertyMixin, object):
         if not instance:
             return self
         def callable():
+            cache = instance._get_field_cache()
             cache_key = '_cached_instances_%s' % self.subresource
-            if not hasattr(instance, cache_key):
-                setattr(instance, cache_key, [])
+            if cache_key not in cache:
+                cache[cache_key] = []
                 url = instance._resource_url(instance.pk) + self.subresource + '/'
                 for data in instance._rest_call(url):
                     obj = self.model(**data)
                     obj._persisted = True
-                    getattr(instance, cache_key).append(obj)
-            return getattr(instance, cache_key)
+                    cache[cache_key].append(obj)
+            return cache[cache_key]
         return callable() if self.as_property else callable
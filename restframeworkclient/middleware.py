@@ -24,9 +24,13 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+import random
 import threading
 
 import django.test
+from django.conf import settings
+
+from restframeworkclient import querylog, unitofwork
 
 _thread_local = threading.local()
 
@@ -49,6 +53,46 @@ class RESTFrameworkClientCacheMiddleware(object):
             _thread_local.request = request
 
 
+class RESTFrameworkClientUnitOfWorkMiddleware(object):
+    """
+    Defers the saves of client model instances made while handling a request
+    and saves each of them once before returning the response, see restframeworkclient.unitofwork.
+
+    The pending saves are discarded when the view raises an exception.
+    """
+    def process_request(self, request):
+        unitofwork.begin()
+
+    def process_response(self, request, response):
+        if unitofwork.get_current() is not None:
+            unitofwork.commit()
+        return response
+
+    def process_exception(self, request, exception):
+        unitofwork.discard()
+
+
+class RESTFrameworkClientQueryLogMiddleware(object):
+    """
+    Logs the REST calls made while handling the requests sampled at the rate set by
+    settings.REST_FRAMEWORK_CLIENT['QUERY_LOG'] (True for all requests) and logs their summary
+    before returning the response, see restframeworkclient.querylog.
+
+    The calls made by the worker threads on behalf of the request are logged
+    when RESTFrameworkClientCacheMiddleware is enabled as well.
+    """
+    def process_request(self, request):
+        rate = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('QUERY_LOG')
+        if rate and (rate is True or random.random() < rate):
+            querylog.begin_request(request)
+
+    def process_response(self, request, response):
+        queries = querylog.end_request(request)
+        if queries is not None:
+            querylog.log_summary(request, queries)
+        return response
+
+
 def get_request():
     """
     Return the current django request from anywhere when RESTFrameworkClientCacheMiddleware is enabled.
@@ -56,3 +100,14 @@ def get_request():
     if hasattr(_thread_local, 'request'):
         return _thread_local.request
     return None
+
+
+def set_request(request):
+    """
+    Makes request the current django request of this thread, e.g. of a worker thread making REST calls on its behalf.
+    """
+    if request is None:
+        if hasattr(_thread_local, 'request'):
+            del _thread_local.request
+    else:
+        _thread_local.request = request
@@ -26,11 +26,11 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 import repr
 import copy
-import json
 import six
 import logging
 import urlparse
 import datetime
+import time
 import threading
 import requests
 import collections
@@ -42,10 +42,12 @@ from django.conf import settings
 from django.utils import timezone
 from django.utils.text import camel_case_to_spaces
 
-from restframeworkclient import fields
+from restframeworkclient import batching, compact, compression, concurrency, fields, jsoncodecs, local, querylog, \
+    ratelimiting, streaming, unitofwork
 from restframeworkclient.exceptions import FieldTypeMismatch, NotPersistedError, BadGatewayResponse, \
     ServerResponseException, NoneValueInParams, ConflictRespose, BadRequestResponse
 from restframeworkclient.filtering import PartiallyFiltered
+from restframeworkclient.hedging import hedged_call
 from restframeworkclient.middleware import get_request
 from restframeworkclient.utils import lookup_by_name, qualname, extend_url_query_string, setattr_lazy_finish
 
@@ -53,10 +55,22 @@ logger = logging.getLogger(__name__)
 
 all_models = set()
 
+# Maps Meta.content_type to the client model, see fields.GenericRelationField
+models_by_content_type = {}
+
 _thread_local = threading.local()
 
 DynamicField = collections.namedtuple('DynamicField', ['name'])
 
+# Maps the model classes to their fields.ParsedField instances, see Model._eagerly_parsed_fields
+_parsed_fields = {}
+
+# Maps the model classes with Meta.compact to their compact.KeyIndex, see Model._key_index
+_key_indexes = {}
+
+# The per instance state which is kept in __slots__ with Meta.compact, see Model._get_field_cache for _field_cache
+_INSTANCE_STATE = ('_attrs', '_original_attrs', '_persisted', '_partially_filtered', '_field_cache')
+
 
 class Manager(object):
     """
@@ -67,7 +81,9 @@ class Manager(object):
         Return a PartiallyFiltered instance if used as a class attribute
         """
         self.model = owner
-        return self.get_queryset()
+        queryset = self.get_queryset()
+        queryset._is_manager_queryset = True
+        return queryset
 
     def get_queryset(self):
         class ManagerPartiallyFiltered(PartiallyFiltered):
@@ -100,6 +116,11 @@ class ModelBase(type):
     Metaclass for the Model defined later
     """
     def __new__(cls, name, bases, attrs):
+        # The instance state of the models with Meta.compact is kept in slots unless a base class already has them
+        if getattr(attrs.get('Meta'), 'compact', False) and not any('_attrs' in dir(base) for base in bases):
+            attrs['__slots__'] = _INSTANCE_STATE
+            if not any('__weakref__' in dir(base) for base in bases):
+                attrs['__slots__'] += ('__weakref__',)
         new_class = super(ModelBase, cls).__new__(cls, name, bases, attrs)
         all_models.add(new_class)
 
@@ -113,6 +134,10 @@ class ModelBase(type):
 
         new_class._init_fields_in_progress = True
         new_class._init_fields()
+        # A Meta inherited from a base class would register the subclass in place of the base class
+        content_type = getattr(attrs.get('Meta'), 'content_type', None)
+        if content_type:
+            models_by_content_type[content_type] = new_class
         del new_class._init_fields_in_progress
 
         return new_class
@@ -129,6 +154,9 @@ class Model(six.with_metaclass(ModelBase)):
     """
     Similar to the Django ORM's Model class
     """
+    # The subclasses get a __dict__ unless they set Meta.compact, see ModelBase
+    __slots__ = ()
+
     objects = Manager()
     _meta = Meta()
 
@@ -150,8 +178,8 @@ class Model(six.with_metaclass(ModelBase)):
         Sets the provided dict of attributes while using setattr as much as possible
         so that custom field classes can handle special cases themselves.
         """
-        self._original_attrs = copy.deepcopy(attrs)
-        self._attrs = copy.deepcopy(attrs)
+        self._original_attrs = self._copy_attrs(attrs)
+        self._attrs = self._copy_attrs(attrs)
 
         for k in attrs.keys():
             if k in dir(self):
@@ -174,7 +202,7 @@ class Model(six.with_metaclass(ModelBase)):
         return super(Model, self).__getattribute__(item)
 
     def __setattr__(self, key, value):
-        if key == '_original_attrs':
+        if key in _INSTANCE_STATE:
             return super(Model, self).__setattr__(key, value)
         is_key_field = isinstance(getattr(self.__class__, key, None), fields.Field)
         is_value_field = isinstance(value, fields.Field)
@@ -265,7 +293,7 @@ class Model(six.with_metaclass(ModelBase)):
                                                                                 repr.repr(cls._primary_key())))
 
     def __repr__(self):
-        return "%s(%s)" % (self.__class__.__name__, repr.repr(self._attrs))
+        return "%s(%s)" % (self.__class__.__name__, repr.repr(dict(self._attrs.items())))
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.pk == other.pk
@@ -277,32 +305,51 @@ class Model(six.with_metaclass(ModelBase)):
     def save(self, update_fields=None):
         """
         Save changes made to a previously fetched instance or persist a new locally created instance.
+
+        Inside restframeworkclient.unitofwork.unit_of_work() the save is deferred until the end of the unit of work.
         """
+        unit_of_work = unitofwork.get_current()
+        if unit_of_work is not None:
+            unit_of_work.register(self, update_fields)
+            return self
+        return self._save(update_fields)
+
+    def _save(self, update_fields=None):
         if not self._persisted:
             url = self._resources_url()
             data = self._attrs
-            json_ = self._rest_call(url, method='POST', data=self._postprocess_data(data))
-            self._original_attrs = json_
-            self._attrs = copy.deepcopy(json_)
-            self._persisted = True
+            json_ = self._rest_call(url, method='POST', **self._body_kwargs(data))
+            self._set_saved_attrs(json_)
         else:
             url = self._resource_url(self.pk)
             if update_fields:
                 data = {k: v for k, v in self._changes.items() if k in update_fields}
-                json_ = self._rest_call(url, method='PATCH', data=self._postprocess_data(data))
-                self._original_attrs = copy.deepcopy(json_)
-                for k in update_fields:
-                    self._attrs[k] = json_[k]
             else:
                 data = self._changes
-                json_ = self._rest_call(url, method='PATCH', data=self._postprocess_data(data))
-                self._original_attrs = json_
-                self._attrs = copy.deepcopy(json_)
+            json_ = self._rest_call(url, method='PATCH', **self._body_kwargs(data))
+            self._set_saved_attrs(json_, update_fields)
         return self
 
+    def _set_saved_attrs(self, json_, update_fields=None):
+        """
+        Sets the attributes returned by the server after saving the instance
+        """
+        if update_fields:
+            self._original_attrs = self._copy_attrs(json_)
+            for k in update_fields:
+                self._attrs[k] = json_[k]
+        else:
+            key_index = self._key_index()
+            self._original_attrs = json_ if key_index is None else compact.CompactAttrs(key_index, json_)
+            self._attrs = self._copy_attrs(json_)
+        self._persisted = True
+
     def delete(self):
         if not self._persisted:
             raise NotPersistedError("It doesn't make sense to delete non-persisted instances")
+        unit_of_work = unitofwork.get_current()
+        if unit_of_work is not None:
+            unit_of_work.unregister(self)
         url = self._resource_url(self.pk)
         json_ = self._rest_call(url, method='DELETE')
         return json_
@@ -317,11 +364,39 @@ class Model(six.with_metaclass(ModelBase)):
         json_ = self._rest_call(url, method='GET')
         self._set_initial_attrs(json_)
 
+    def asave(self, update_fields=None):
+        """
+        Like save but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.save, update_fields=update_fields)
+
+    def adelete(self):
+        """
+        Like delete but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.delete)
+
+    def arefresh_from_db(self):
+        """
+        Like refresh_from_db but returns a Future, see restframeworkclient.concurrency
+        """
+        return concurrency.submit(self.refresh_from_db)
+
+    def aresolve(self, name):
+        """
+        Returns a Future of the attribute with the given name, e.g. `device.aresolve('customer')`
+        fetches the instance referenced by the Reference `customer` on the thread pool.
+        """
+        return concurrency.submit(getattr, self, name)
+
     @classmethod
-    def _postprocess_data(cls, data):
+    def _postprocess_data(cls, data, encode_dicts=True):
+        """
+        :param encode_dicts: whether to encode dict values as JSON strings which is needed for form-encoded bodies
+        """
         def get_value(value):
-            if isinstance(value, dict):
-                return json.dumps(value)
+            if isinstance(value, dict) and encode_dicts:
+                return jsoncodecs.get_codec().dumps(value)
             if value in (datetime.datetime.now, timezone.now):
                 return value()
             if isinstance(value, Model):
@@ -329,6 +404,111 @@ class Model(six.with_metaclass(ModelBase)):
             return value
         return {k: get_value(v) for k, v in data.items()}
 
+    @classmethod
+    def _eagerly_parsed_fields(cls):
+        """
+        Returns the fields parsing the values received from the server, e.g. DateTimeField, if they should be parsed
+        for the whole page when the instances are created as set by Meta.eager_parsing falling back to
+        settings.REST_FRAMEWORK_CLIENT['EAGER_PARSING'], an empty list otherwise, see fields.ParsedField.parse_column
+        """
+        eager_parsing = getattr(cls.Meta, 'eager_parsing', None)
+        if eager_parsing is None:
+            eager_parsing = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('EAGER_PARSING', False)
+        if not eager_parsing:
+            return []
+        parsed_fields = _parsed_fields.get(cls)
+        if parsed_fields is None:
+            parsed_fields = _parsed_fields[cls] = [getattr(cls, name) for name in dir(cls)
+                                                   if isinstance(getattr(cls, name, None), fields.ParsedField)]
+        return parsed_fields
+
+    @classmethod
+    def _key_index(cls):
+        """
+        Returns the compact.KeyIndex shared by the instances if Meta.compact is set, None otherwise.
+        The index starts with the primary key and the fields of the model, see compact.CompactAttrs
+        """
+        if not getattr(getattr(cls, 'Meta', None), 'compact', False):
+            return None
+        key_index = _key_indexes.get(cls)
+        if key_index is None:
+            field_names = [getattr(getattr(cls, name, None), 'field_name', None) for name in dir(cls)]
+            key_index = _key_indexes[cls] = compact.KeyIndex(
+                [cls._primary_key()] + sorted(name for name in field_names if isinstance(name, six.string_types)))
+        return key_index
+
+    def _copy_attrs(self, attrs):
+        """
+        Returns a deep copy of the attributes, as compact.CompactAttrs if Meta.compact is set
+        """
+        key_index = self._key_index()
+        if key_index is None:
+            return copy.deepcopy(attrs)
+        return compact.copy_attrs(key_index, attrs)
+
+    def _get_field_cache(self, create=True):
+        """
+        Returns the dict in which the fields cache the values computed from the attributes, e.g. the instances
+        fetched by Reference: the __dict__ of the instance or with Meta.compact a dict kept in a slot.
+        The dict of a compact instance is created on first use, None is returned instead if create is False.
+        """
+        try:
+            return self.__dict__
+        except AttributeError:
+            pass
+        try:
+            return self._field_cache
+        except AttributeError:
+            if not create:
+                return None
+            self._field_cache = {}
+            return self._field_cache
+
+    def __getstate__(self):
+        """
+        Returns the state of the instance for pickle and copy including the slots of the compact instances
+        whose attributes are saved as dicts. The queryset the instance was fetched by, which is only used for
+        prefetch_related, is left out.
+        """
+        state = dict(getattr(self, '__dict__', {}))
+        if self._key_index() is not None:
+            for name in _INSTANCE_STATE:
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+            for name in ('_attrs', '_original_attrs'):
+                if name in state:
+                    state[name] = dict(state[name].items())
+        state.pop('_partially_filtered', None)
+        return state
+
+    def __setstate__(self, state):
+        key_index = self._key_index()
+        for name, value in state.items():
+            if key_index is not None and name in ('_attrs', '_original_attrs'):
+                value = compact.CompactAttrs(key_index, value)
+            super(Model, self).__setattr__(name, value)
+
+    @classmethod
+    def _request_format(cls):
+        """
+        Returns the format of the request bodies sent by save(), Method and the bulk operations from
+        Meta.request_format falling back to settings.REST_FRAMEWORK_CLIENT['REQUEST_FORMAT']:
+        'form' (default) for form-encoded bodies with dict values encoded as JSON strings
+        or 'json' for JSON bodies encoded at once by the JSON codec, see restframeworkclient.jsoncodecs
+        """
+        return (getattr(cls.Meta, 'request_format', None) or
+                getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('REQUEST_FORMAT') or 'form')
+
+    @classmethod
+    def _body_kwargs(cls, data):
+        """
+        Returns the kwargs of _rest_call sending data as the request body in the request format of the model.
+        Bodies with files are sent as forms regardless of the format.
+        """
+        if cls._request_format() == 'json' and not any(hasattr(value, 'read') for value in data.values()):
+            return {'json': cls._postprocess_data(data, encode_dicts=False)}
+        return {'data': cls._postprocess_data(data)}
+
     @classmethod
     def _check_params_for_none_values(cls, kwargs, url, method):
         for k, v in kwargs['params'].items():
@@ -342,44 +522,197 @@ class Model(six.with_metaclass(ModelBase)):
         if 'params' in kwargs and kwargs['params'] is not None:
             cls._check_params_for_none_values(kwargs, url, method)
 
+        _thread_local.response_size = None
+        _thread_local.response_status = None
         request = get_request()
+        log = querylog.get_log(request)
         cache_key = extend_url_query_string(url, kwargs.get('params', {}))
+        if method.upper() == 'HEAD':
+            cache_key = 'HEAD ' + cache_key
         if request:
             if not hasattr(request, '_restframeworkclient_cache'):
                 request._restframeworkclient_cache = {}
 
-            if method.upper() == 'GET':
+            if method.upper() in ('GET', 'HEAD'):
                 if cache_key in request._restframeworkclient_cache:
                     result = request._restframeworkclient_cache[cache_key]
-                    logger.debug('(cached) {method} {url} {kwargs}'.format(method=method, url=url, kwargs=kwargs))
+                    logger.debug('(cached) %s %s %s', method, url, kwargs)
+                    if log is not None:
+                        querylog.record(log, cls, method, url, kwargs.get('params'), None, None, 0.0, cached=True)
                     return result
             else:
                 request._restframeworkclient_cache = {}
 
-        result = cls._execute_rest_call(url, method, **kwargs)
-        logger.debug('{method} {url} {kwargs}'.format(method=method, url=url, kwargs=kwargs))
-        if request and method.upper() == 'GET':
+        querylog.detect_n_plus_one(request, cls, method, url, kwargs.get('params'))
+        start = time.time() if log is not None else None
+        try:
+            result = cls._execute_rest_call(url, method, **kwargs)
+        finally:
+            if log is not None:
+                querylog.record(log, cls, method, url, kwargs.get('params'), _thread_local.response_status,
+                                _thread_local.response_size, time.time() - start, cached=False)
+        logger.debug('%s %s %s', method, url, kwargs)
+        # A streamed page can be read only once
+        if request and method.upper() in ('GET', 'HEAD') and not isinstance(result, streaming.StreamedPage):
             request._restframeworkclient_cache[cache_key] = result
         return result
 
     @classmethod
     def _execute_rest_call(cls, url, method, **kwargs):
+        batch = batching.get_batch(cls, url, method, kwargs)
+        if batch is not None:
+            response = batch.call(cls, method, url, kwargs)
+            cls._handle_response_status_code(response, url, method, **kwargs)
+            return response.data
+
         if getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('USE_LOCAL_REST_FRAMEWORK'):
             return cls._direct_rest_call_to_restframework(url, method, **kwargs)
 
-        if not hasattr(_thread_local, 'session'):
-            _thread_local.session = requests.Session()
-
-        response = _thread_local.session.request(method.upper(), url, verify=True, **kwargs)
+        if kwargs.get('json') is not None:
+            kwargs = cls._encode_json_body(kwargs)
+        kwargs = compression.prepare_request(cls, kwargs)
+
+        ratelimiting.throttle(cls)
+
+        hedging = cls._hedged_requests_options() if method.upper() == 'GET' else None
+        if hedging:
+            # The hedged calls are sent concurrently from the worker threads of restframeworkclient.hedging
+            # and requests.Session is not thread-safe, so each worker uses its own session which keeps
+            # its connections alive as the workers are reused
+            response = hedged_call(lambda: _get_session().request(method.upper(), url, verify=True, **kwargs),
+                                   delay=hedging['DELAY'], max_rate=hedging['MAX_RATE'],
+                                   may_hedge=lambda: ratelimiting.try_throttle(cls),
+                                   discard=lambda response: response.close())
+        else:
+            response = _get_session().request(method.upper(), url, verify=True, **kwargs)
 
         cls._handle_response_status_code(response, url, method, **kwargs)
-
-        if response.text:
-            return response.json()
+        if kwargs.get('stream') and method.upper() == 'GET':
+            chunk_size = (cls._streaming_options() or {}).get('CHUNK_SIZE', 64 * 1024)
+            return streaming.StreamedPage(response.iter_content(chunk_size), close=response.close)
+        _thread_local.response_size = len(response.content)
+
+        if method.upper() == 'HEAD':
+            return response.headers
+        if response.content:
+            # Decoding the bytes directly avoids guessing the encoding of response.text
+            return jsoncodecs.get_codec().loads(response.content)
         else:
             # e.g. when using DELETE
             return None
 
+    @classmethod
+    def _encode_json_body(cls, kwargs):
+        """
+        Replaces the json kwarg by the body encoded by the JSON codec, see restframeworkclient.jsoncodecs,
+        as the requests library can't encode values such as datetimes or decimals.
+        """
+        kwargs = kwargs.copy()
+        headers = dict(kwargs.get('headers') or {})
+        headers['Content-Type'] = 'application/json'
+        kwargs['headers'] = headers
+        kwargs['data'] = jsoncodecs.get_codec().dumps(kwargs.pop('json'))
+        return kwargs
+
+    @classmethod
+    def _hedged_requests_options(cls):
+        """
+        Returns the hedging options from Meta.hedged_requests falling back to
+        settings.REST_FRAMEWORK_CLIENT['HEDGED_REQUESTS'] or None if hedging is disabled.
+        """
+        options = getattr(cls.Meta, 'hedged_requests', None)
+        if options is None:
+            options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('HEDGED_REQUESTS')
+        if not options:
+            return None
+        return {
+            'DELAY': options.get('DELAY', 0.1),
+            'MAX_RATE': options.get('MAX_RATE', 0.05),
+        }
+
+    @classmethod
+    def _count_options(cls):
+        """
+        Returns the options of PartiallyFiltered.count from Meta.count falling back to
+        settings.REST_FRAMEWORK_CLIENT['COUNT'].
+
+        MODE is one of
+         'limit' (default): a GET with limit=1 reading the count of the paginated response
+         'limit_zero': the same with limit=0 if the server's pagination allows it
+         'param': a GET with the query parameter PARAM=1 (count_only by default) for the server to return just the count
+         'head': a HEAD request reading the count from the HEADER response header (X-Total-Count by default)
+        """
+        options = getattr(cls.Meta, 'count', None)
+        if options is None:
+            options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('COUNT') or {}
+        return {
+            'MODE': options.get('MODE', 'limit'),
+            'PARAM': options.get('PARAM', 'count_only'),
+            'HEADER': options.get('HEADER', 'X-Total-Count'),
+        }
+
+    @classmethod
+    def _pagination_options(cls):
+        """
+        Returns the pagination options from Meta.pagination falling back to
+        settings.REST_FRAMEWORK_CLIENT['PAGINATION'].
+
+        MODE is one of
+         'offset' (default): the server uses LimitOffsetPagination, slicing is done by the limit and offset params
+         'cursor': the server uses CursorPagination, the next links are followed and slicing is done on the client
+         'keyset': like 'offset' but the pages of PAGE_SIZE (100 by default) results are fetched by filtering
+          the ordering field (the primary key by default) to be greater than its last value, e.g. id__gt=100,
+          instead of increasing the offset. It requires the ordering field to be unique and filterable this way.
+        """
+        options = getattr(cls.Meta, 'pagination', None)
+        if options is None:
+            options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('PAGINATION') or {}
+        return {
+            'MODE': options.get('MODE', 'offset'),
+            'PAGE_SIZE': options.get('PAGE_SIZE', 100),
+        }
+
+    @classmethod
+    def _adaptive_page_size_options(cls, force=False):
+        """
+        Returns the options of the adaptive page size from Meta.adaptive_page_size falling back to
+        settings.REST_FRAMEWORK_CLIENT['ADAPTIVE_PAGE_SIZE'] or None if it is disabled, unless forced.
+
+        The page size starts at INITIAL_SIZE unless a page size is set and stays between MIN_SIZE and MAX_SIZE
+        aiming at TARGET_TIME seconds per page and at most MAX_BYTES per response body if set.
+        """
+        options = getattr(cls.Meta, 'adaptive_page_size', None)
+        if options is None:
+            options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('ADAPTIVE_PAGE_SIZE')
+        if not options and not force:
+            return None
+        options = options or {}
+        return {
+            'INITIAL_SIZE': options.get('INITIAL_SIZE', 100),
+            'MIN_SIZE': options.get('MIN_SIZE', 10),
+            'MAX_SIZE': options.get('MAX_SIZE', 1000),
+            'TARGET_TIME': options.get('TARGET_TIME', 0.5),
+            'MAX_BYTES': options.get('MAX_BYTES'),
+        }
+
+    @classmethod
+    def _streaming_options(cls):
+        """
+        Returns the options of parsing the pages of results while they are received from Meta.streaming falling back
+        to settings.REST_FRAMEWORK_CLIENT['STREAMING'] or None if it is disabled, see restframeworkclient.streaming
+
+        CHUNK_SIZE is the number of bytes read from the response at once.
+        """
+        options = getattr(cls.Meta, 'streaming', None)
+        if options is None:
+            options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('STREAMING')
+        if not options:
+            return None
+        options = options if isinstance(options, dict) else {}
+        return {
+            'CHUNK_SIZE': options.get('CHUNK_SIZE', 64 * 1024),
+        }
+
     @classmethod
     def _direct_rest_call_to_restframework(cls, url, method, **kwargs):
         """
@@ -390,31 +723,42 @@ class Model(six.with_metaclass(ModelBase)):
         It requires settings.REST_FRAMEWORK_CLIENT['BASE_URLS'] to be set to a dict with keys being url prefixes
         in which the urlconf has the REST Framework urlconf included and dict values being the the base urls
         specified in the Model.Meta.base_url
+
+        Setting settings.REST_FRAMEWORK_CLIENT['LOCAL_TRANSPORT'] to 'dispatch' calls the views directly
+        instead of using the ApiClient, see restframeworkclient.local.dispatch
         """
-        client = APIClient()
         params = kwargs.get('params', {}) or {}
         data = kwargs.get('data', {}) or {}
+        json_data = kwargs.get('json')
 
         # Like the requests library, ignore any None values in data
         data = {k: v
                 for k, v in data.items()
                 if v is not None}
 
+        api = local.get_api_prefix(url)
         url = extend_url_query_string(url, params)
         url_parsed = urlparse.urlparse(url)
-        path = url_parsed.path + '?' + url_parsed.query
+        path = url_parsed.path
+        if api is not None:
+            path = '/%s%s' % (api, path)
 
-        for api, api_baseurl in settings.REST_FRAMEWORK_CLIENT.get('BASE_URLS').items():
-            if url.startswith(api_baseurl):
-                path = '/%s%s' % (api, path)
-                break
-
-        response = getattr(client, method.lower())(path, data)
+        if settings.REST_FRAMEWORK_CLIENT.get('LOCAL_TRANSPORT') == 'dispatch':
+            response = local.dispatch(method, path, url_parsed.query, data, json_data)
+        else:
+            client = APIClient()
+            if json_data is not None:
+                response = getattr(client, method.lower())(path + '?' + url_parsed.query, json_data, format='json')
+            else:
+                response = getattr(client, method.lower())(path + '?' + url_parsed.query, data)
         cls._handle_response_status_code(response, url, method, **kwargs)
+        if method.upper() == 'HEAD':
+            return requests.structures.CaseInsensitiveDict(response.items())
         return response.data
 
     @classmethod
     def _handle_response_status_code(cls, response, url, method, **kwargs):
+        _thread_local.response_status = response.status_code
         if not (200 <= response.status_code < 300):
             if isinstance(response, requests.models.Response):
                 reason = response.reason
@@ -422,7 +766,7 @@ class Model(six.with_metaclass(ModelBase)):
             elif isinstance(response, rest_framework.response.Response):
                 reason = response.reason_phrase
                 content = response.data
-            else:  # Probably django.http.response.HttpResponseNotFound
+            else:  # Probably django.http.response.HttpResponseNotFound or batching.BatchItemResponse
                 reason = response.reason_phrase
                 content = response.content
             message = '{status_code} {reason}\n{method} {url} {kwargs}\n{content}'.format(
@@ -459,3 +803,20 @@ class Model(six.with_metaclass(ModelBase)):
     @classmethod
     def _resource_url(cls, pk):
         return '%s/%s/%s/' % (cls._base_url(), cls.Meta.resource, pk)
+
+
+def last_response_size():
+    """
+    Returns the length of the body of the last response received by the current thread in Model._rest_call
+    or None if it was not received over HTTP, e.g. when it was cached
+    """
+    return getattr(_thread_local, 'response_size', None)
+
+
+def _get_session():
+    """
+    Returns the requests.Session of the current thread
+    """
+    if not hasattr(_thread_local, 'session'):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
@@ -0,0 +1,256 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import os
+import re
+import logging
+import threading
+import traceback
+import contextlib
+import collections
+
+from django.conf import settings
+
+from restframeworkclient.exceptions import NPlusOneError
+
+logger = logging.getLogger(__name__)
+
+_thread_local = threading.local()
+
+
+class Connection(object):
+    """
+    Provides the log of the REST calls similar to django.db.connection.queries.
+
+    The log is kept per thread while enabled by enable() or capture() and per request while enabled by
+    restframeworkclient.middleware.RESTFrameworkClientQueryLogMiddleware. Nothing is recorded otherwise.
+    """
+    @property
+    def queries(self):
+        """
+        Returns the list of the logged calls, dicts with the keys method, url, params, status, size (of the response
+        body in bytes), time (in seconds), cached (whether the result came from the per request cache),
+        model and field (e.g. 'Device.customer' when the call was made by dereferencing a Reference).
+        Only the first page of the results of a ReverseReference queryset is attributed to the field.
+        """
+        log = get_log()
+        return list(log) if log is not None else []
+
+    @property
+    def queries_logged(self):
+        return get_log() is not None
+
+    def enable(self):
+        """
+        Starts logging the calls made by this thread
+        """
+        if getattr(_thread_local, 'queries', None) is None:
+            _thread_local.queries = []
+
+    def disable(self):
+        _thread_local.queries = None
+
+    def reset_queries(self):
+        log = get_log()
+        if log is not None:
+            del log[:]
+
+
+connection = Connection()
+
+
+def get_log(request=None):
+    """
+    Returns the list the calls are logged to or None if the log is disabled
+    """
+    log = getattr(_thread_local, 'queries', None)
+    if log is None:
+        if request is None:
+            from restframeworkclient.middleware import get_request
+            request = get_request()
+        log = getattr(request, '_restframeworkclient_queries', None)
+    return log
+
+
+def get_current():
+    """
+    Returns the log enabled for this thread by enable() or capture() or None
+    """
+    return getattr(_thread_local, 'queries', None)
+
+
+def set_current(log):
+    """
+    Makes log the log of this thread, e.g. of a worker thread making REST calls on behalf of another thread
+    """
+    _thread_local.queries = log
+
+
+@contextlib.contextmanager
+def capture():
+    """
+    Logs the calls made by this thread in the block to the list returned, e.g.
+
+        with querylog.capture() as queries:
+            list(Device.objects.all())
+        assert len(queries) == 1
+
+    The calls are also kept in the log enabled outside of the block if any.
+    """
+    previous = getattr(_thread_local, 'queries', None)
+    queries = _thread_local.queries = []
+    try:
+        yield queries
+    finally:
+        _thread_local.queries = previous
+        if previous is not None:
+            previous.extend(queries)
+
+
+def begin_request(request):
+    """
+    Starts logging the calls made by this thread and by the worker threads on behalf of request
+    """
+    request._restframeworkclient_previous_queries = getattr(_thread_local, 'queries', None)
+    request._restframeworkclient_queries = _thread_local.queries = []
+
+
+def end_request(request):
+    """
+    Stops logging the calls made on behalf of request and returns the calls logged for request.
+
+    The log enabled for this thread before begin_request if any is restored and the calls are also kept in it.
+    """
+    if hasattr(request, '_restframeworkclient_previous_queries'):
+        previous = _thread_local.queries = request._restframeworkclient_previous_queries
+        del request._restframeworkclient_previous_queries
+        if previous is not None:
+            previous.extend(request._restframeworkclient_queries)
+    return getattr(request, '_restframeworkclient_queries', None)
+
+
+class accessing(object):
+    """
+    Attributes the calls made in the block to field, a tuple of the model class and the attribute name
+    such as (Device, 'customer'), see Reference.__get__. Nothing changes if field is None.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __enter__(self):
+        self.previous = getattr(_thread_local, 'field', None)
+        if self.field is not None:
+            _thread_local.field = self.field
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _thread_local.field = self.previous
+
+
+def record(log, model, method, url, params, status, size, time, cached):
+    field = getattr(_thread_local, 'field', None)
+    log.append({
+        'method': method.upper(),
+        'url': url,
+        'params': params,
+        'status': status,
+        'size': size,
+        'time': time,
+        'cached': cached,
+        'model': model.__name__,
+        'field': '%s.%s' % (field[0].__name__, field[1]) if field else None,
+    })
+
+
+def log_summary(request, queries):
+    """
+    Logs the number and the duration of the calls made while handling request,
+    the calls themselves are passed in the `rest_calls` attribute of the log record
+    """
+    logger.info('%s %s: %d REST calls (%d cached) in %.3f s', request.method, request.path, len(queries),
+                sum(1 for query in queries if query['cached']), sum(query['time'] for query in queries),
+                extra={'rest_calls': queries})
+
+
+def _n_plus_one_options():
+    """
+    Returns the options of the N+1 detector from settings.REST_FRAMEWORK_CLIENT['N_PLUS_ONE'] or None if disabled
+    """
+    options = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('N_PLUS_ONE')
+    if not options:
+        return None
+    return dict({'ACTION': 'log', 'THRESHOLD': 3}, **options)
+
+
+def _url_pattern(model, url, params):
+    """
+    Returns url with the primary key and the values of the query string replaced by placeholders
+    """
+    url, _, query = url.partition('?')
+    resources_url = model._resources_url()
+    if url.startswith(resources_url) and url != resources_url:
+        url = resources_url + '{pk}/'
+    keys = sorted(set(re.findall(r'(?:^|&)([^=&]+)', query)) | set(params or ()))
+    return url + ('?' + '&'.join('%s=...' % key for key in keys) if keys else '')
+
+
+def _call_site():
+    """
+    Returns the innermost frame of the stack outside of restframeworkclient as "file:line in function"
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    for filename, line, function, _ in reversed(traceback.extract_stack()):
+        if not os.path.abspath(filename).startswith(package) and os.path.basename(filename) != 'contextlib.py':
+            return '%s:%s in %s' % (filename, line, function)
+    return None
+
+
+def detect_n_plus_one(request, model, method, url, params):
+    """
+    Counts the calls made by dereferencing the same field of different instances while handling request and
+    logs or raises NPlusOneError once they reach the threshold set by settings.REST_FRAMEWORK_CLIENT['N_PLUS_ONE']
+    """
+    field = getattr(_thread_local, 'field', None)
+    if field is None or request is None:
+        return
+    options = _n_plus_one_options()
+    if options is None:
+        return
+    if not hasattr(request, '_restframeworkclient_n_plus_one'):
+        request._restframeworkclient_n_plus_one = collections.Counter()
+    key = (field, method.upper(), _url_pattern(model, url, params))
+    counter = request._restframeworkclient_n_plus_one
+    counter[key] += 1
+    if counter[key] != options['THRESHOLD']:
+        return
+    from restframeworkclient.fields import Reference
+    owner, name = field
+    method_name = 'select_related' if isinstance(getattr(owner, name, None), Reference) else 'prefetch_related'
+    message = '%d REST calls %s %s made by %s.%s of different instances in one request (N+1), the last one at %s. ' \
+              'Consider %s(\'%s\') on the queryset of %s.' % (counter[key], key[1], key[2], owner.__name__, name,
+                                                             _call_site(), method_name, name, owner.__name__)
+    if options['ACTION'] == 'raise':
+        raise NPlusOneError(message)
+    logger.warning(message)
@@ -0,0 +1,137 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import time
+import threading
+
+from django.conf import settings
+
+from restframeworkclient.utils import qualname
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket refilled by `rate` tokens per second up to `burst` tokens.
+
+    Callers reserve their token immediately and sleep until it is refilled so concurrent callers
+    are paced at a steady rate instead of competing for each refilled token.
+    """
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.timestamp = time.time()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+
+    def acquire(self):
+        """
+        Takes one token, sleeping as long as needed for it to become available.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """
+        Takes one token only if it is available right now.
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def refund(self):
+        """
+        Gives back a token taken by try_acquire but not used.
+        """
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+
+def _get_bucket(key, limit):
+    """
+    :param limit: either `rate` (requests per second) or a tuple `(rate, burst)`
+    """
+    rate, burst = limit if isinstance(limit, (list, tuple)) else (limit, 1)
+    key = key + (rate, burst)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(key, TokenBucket(rate, burst))
+    return bucket
+
+
+def _get_buckets(model):
+    """
+    Returns the buckets shared by all threads that apply to REST calls of the model:
+    the one of settings.REST_FRAMEWORK_CLIENT['RATE_LIMITS'][Meta.base_url] and the one of Meta.rate_limit.
+    """
+    buckets = []
+    base_url_limits = getattr(settings, 'REST_FRAMEWORK_CLIENT', {}).get('RATE_LIMITS')
+    if base_url_limits:
+        base_url = model._base_url()
+        if base_url in base_url_limits:
+            buckets.append(_get_bucket(('base_url', base_url), base_url_limits[base_url]))
+    model_limit = getattr(model.Meta, 'rate_limit', None)
+    if model_limit:
+        buckets.append(_get_bucket(('model', qualname(model)), model_limit))
+    return buckets
+
+
+def throttle(model):
+    """
+    Blocks until a REST call of the model is allowed by all of its rate limits.
+    """
+    for bucket in _get_buckets(model):
+        bucket.acquire()
+
+
+def try_throttle(model):
+    """
+    Like throttle but returns False instead of blocking when a REST call is not allowed right now.
+    """
+    acquired = []
+    for bucket in _get_buckets(model):
+        if not bucket.try_acquire():
+            # The tokens already taken from the other buckets would be lost for the calls which are allowed
+            for acquired_bucket in acquired:
+                acquired_bucket.refund()
+            return False
+        acquired.append(bucket)
+    return True
@@ -0,0 +1,224 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import re
+import json
+import time
+import codecs
+import collections
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+class _Reader(object):
+    """
+    Decodes the JSON values of a UTF-8 encoded stream one by one keeping only the unparsed part in memory.
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u''
+        self.pos = 0
+        self.size = 0
+        self.done = False
+
+    def read_more(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            text = self.decoder.decode(b'', final=True)
+            self.done = True
+        else:
+            self.size += len(chunk)
+            text = self.decoder.decode(chunk)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+
+    def peek(self):
+        """
+        Returns the next character other than whitespace without consuming it
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.done:
+                raise ValueError('Unexpected end of JSON')
+            self.read_more()
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError('Expecting one of %r, got %r' % (chars, self.buffer[self.pos:self.pos + 20]))
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.done:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.done:
+                    raise
+            self.read_more()
+
+
+def _parse(reader):
+    """
+    Yields (key, value) for the members of the JSON object read and (None, result) for each item
+    of its 'results' list instead of the list.
+    """
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'results' and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.expect(']')
+            else:
+                while True:
+                    yield None, reader.value()
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            yield key, reader.value()
+        if reader.expect(',}') == '}':
+            return
+
+
+class StreamedPage(object):
+    """
+    A page of results whose response body is parsed while being received.
+
+    Works like the decoded page for PartiallyFiltered: page['results'] is an iterator yielding each result
+    as soon as it is parsed and the other keys such as page['count'] or page['next'] are parsed up to
+    when they are accessed. A key following the results makes the remaining results be parsed into memory
+    unless they have been iterated over already. The results can be iterated over once.
+    """
+    def __init__(self, chunks, close=None):
+        """
+        :param chunks: iterable of the UTF-8 encoded bytes of the body, e.g. requests.Response.iter_content(...)
+        :param close: called when the body is parsed or the iteration over the results is abandoned
+        """
+        self._reader = _Reader(chunks)
+        self._events = _parse(self._reader)
+        self._values = {}
+        self._pending_results = collections.deque()
+        self._close = close
+        self.finished = False
+        self.result_count = 0
+        self.last_result = None
+        # Seconds spent receiving and parsing the body
+        self.elapsed = 0.0
+        # Called with the page once the body is parsed
+        self.on_finish = None
+
+    @property
+    def size(self):
+        """
+        The number of bytes of the body received so far
+        """
+        return self._reader.size
+
+    def _advance(self):
+        if self.finished:
+            return None
+        start = time.time()
+        try:
+            event = next(self._events, None)
+        except Exception:
+            self.close()
+            raise
+        self.elapsed += time.time() - start
+        if event is None:
+            self.finished = True
+            self.close()
+            if self.on_finish is not None:
+                self.on_finish(self)
+            return None
+        key, value = event
+        if key is None:
+            self.result_count += 1
+        else:
+            self._values[key] = value
+        return event
+
+    def _iter_results(self):
+        try:
+            while True:
+                if self._pending_results:
+                    result = self._pending_results.popleft()
+                else:
+                    event = self._advance()
+                    if event is None:
+                        return
+                    key, result = event
+                    if key is not None:
+                        continue
+                self.last_result = result
+                yield result
+        finally:
+            if not self.finished:
+                self.close()
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __getitem__(self, key):
+        if key == 'results':
+            return self._iter_results()
+        while key not in self._values:
+            event = self._advance()
+            if event is None:
+                break
+            if event[0] is None:
+                self._pending_results.append(event[1])
+        return self._values[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def last_result(page):
+    """
+    Returns the last result of a page which has been iterated over, either decoded or a StreamedPage
+    """
+    if isinstance(page, StreamedPage):
+        return page.last_result
+    return page['results'][-1] if page['results'] else None
@@ -0,0 +1,70 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import contextlib
+
+from restframeworkclient import querylog
+
+
+@contextlib.contextmanager
+def assert_num_rest_calls(num):
+    """
+    Fails unless exactly num REST calls are made by the block, the calls served by the per-request cache
+    are not counted, e.g.
+
+        with assert_num_rest_calls(2):
+            devices = list(Device.objects.select_related('customer'))
+            customers = [device.customer for device in devices]
+
+    The calls made on the thread pool on behalf of the block are counted as well.
+    """
+    with querylog.capture() as queries:
+        yield queries
+    calls = [query for query in queries if not query['cached']]
+    if len(calls) != num:
+        raise AssertionError('%d REST calls were made, %d expected:\n%s' % (
+            len(calls), num, '\n'.join('%d. %s' % (i, _describe(call)) for i, call in enumerate(calls, start=1))))
+
+
+def _describe(call):
+    description = '%s %s' % (call['method'], call['url'])
+    if call['params']:
+        description += ' %s' % call['params']
+    if call['field']:
+        description += ' (%s)' % call['field']
+    return description
+
+
+class RESTFrameworkClientTestMixin(object):
+    """
+    Adds assertNumRestCalls to unittest.TestCase subclasses similar to Django's assertNumQueries
+    """
+    def assertNumRestCalls(self, num, func=None, *args, **kwargs):
+        context = assert_num_rest_calls(num)
+        if func is None:
+            return context
+        with context:
+            func(*args, **kwargs)
@@ -0,0 +1,163 @@
+""""
+Django REST Framework client
+https://github.com/qvantel/django-rest-framework-client
+Copyright (c) 2017, Qvantel
+All rights reserved.
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * Neither the name of the Qvantel nor the
+      names of its contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL QVANTEL BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+import threading
+import collections
+import contextlib
+
+_thread_local = threading.local()
+
+
+class UnitOfWork(object):
+    """
+    Collects the instances saved by Model.save() and saves each of them only once when flushed.
+
+    The update_fields of the repeated saves of the same instance are merged
+    and the changed fields are computed at the time of the flush.
+    """
+    def __init__(self):
+        self._pending = collections.OrderedDict()
+
+    def register(self, instance, update_fields=None):
+        key = id(instance)
+        if key in self._pending:
+            _, previous_update_fields = self._pending[key]
+            if previous_update_fields is None or update_fields is None:
+                update_fields = None
+            else:
+                update_fields = list(previous_update_fields) + \
+                    [field for field in update_fields if field not in previous_update_fields]
+        self._pending[key] = (instance, update_fields)
+
+    def unregister(self, instance):
+        self._pending.pop(id(instance), None)
+
+    def _dependency_levels(self):
+        """
+        Splits the pending saves into levels so that the instances not yet persisted on the server
+        are saved in an earlier level than the instances referring to them.
+        """
+        from restframeworkclient.models import Model
+        pending = self._pending
+        dependencies = {}
+        for key, (instance, _) in pending.items():
+            dependencies[key] = {id(value) for value in instance._attrs.values()
+                                 if isinstance(value, Model) and not value._persisted and id(value) in pending}
+        levels = []
+        done = set()
+        while len(done) < len(pending):
+            level = [key for key in pending if key not in done and dependencies[key] <= done]
+            if not level:
+                raise ValueError('Circular references between instances not yet saved')
+            levels.append([pending[key] for key in level])
+            done.update(level)
+        return levels
+
+    def flush(self):
+        """
+        Saves the pending instances, concurrently unless they depend on each other.
+        The first error raised stops the flush and the remaining instances are not saved.
+        """
+        from restframeworkclient import concurrency
+        levels = self._dependency_levels()
+        self._pending.clear()
+        for level in levels:
+            futures = [concurrency.submit(instance._save, update_fields) for instance, update_fields in level
+                       if not _is_saved(instance, update_fields)]
+            concurrency.wait(futures)
+
+    def discard(self):
+        self._pending.clear()
+
+
+def _is_saved(instance, update_fields):
+    """
+    Returns whether the instance has no changes to save any more, e.g. after being saved by a bulk operation
+    """
+    if not instance._persisted:
+        return False
+    changes = instance._changes
+    return not (changes if update_fields is None else [k for k in changes if k in update_fields])
+
+
+def get_current():
+    """
+    Returns the UnitOfWork active in this thread or None
+    """
+    stack = getattr(_thread_local, 'stack', None)
+    return stack[0] if stack else None
+
+
+def set_current(unit_of_work):
+    """
+    Makes unit_of_work active in this thread, e.g. in a worker thread making REST calls on behalf of another thread
+    """
+    _thread_local.stack = [unit_of_work] if unit_of_work is not None else []
+
+
+def begin():
+    """
+    Starts deferring the saves in this thread until commit() is called.
+    Nested calls join the unit of work already in progress.
+    """
+    if not hasattr(_thread_local, 'stack'):
+        _thread_local.stack = []
+    _thread_local.stack.append(get_current() or UnitOfWork())
+
+
+def commit():
+    """
+    Flushes the pending saves when ending the outermost unit of work.
+    """
+    unit_of_work = _thread_local.stack.pop()
+    if not _thread_local.stack:
+        unit_of_work.flush()
+
+
+def discard():
+    """
+    Drops the pending saves when ending the outermost unit of work.
+    """
+    unit_of_work = _thread_local.stack.pop()
+    if not _thread_local.stack:
+        unit_of_work.discard()
+
+
+@contextlib.contextmanager
+def unit_of_work():
+    """
+    Defers the saves made in the block and saves each instance once at its end.
+    The saves are discarded when the block raises an exception.
+
+    Note that instances created in the block get their primary keys only at its end.
+    """
+    begin()
+    try:
+        yield get_current()
+    except Exception:
+        discard()
+        raise
+    commit()
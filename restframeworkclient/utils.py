@@ -110,6 +110,8 @@ class Indexable(object):
     def __init__(self, it):
         self.it = iter(it)
         self.already_computed = []
+        # Whether all items have been computed
+        self.exhausted = False
 
     def __iter__(self):
         already_computed_it = iter(self.already_computed)
@@ -120,7 +122,7 @@ class Indexable(object):
                     self.already_computed.append(item)
                 yield next(already_computed_it)
         except StopIteration:
-            pass
+            self.exhausted = True
 
     def __getitem__(self, index):
         try:
@@ -129,7 +131,10 @@ class Indexable(object):
             max_idx = index
         n = max_idx - len(self.already_computed) + 1
         if n > 0:
+            computed = len(self.already_computed)
             self.already_computed.extend(itertools.islice(self.it, n))
+            if len(self.already_computed) - computed < n:
+                self.exhausted = True
         return self.already_computed[index]
 
     def __nonzero__(self):
@@ -216,3 +221,51 @@ def min_ignoring_nones(a, b):
     if b is None:
         return a
     return min(a, b)
+
+
+class AdaptivePageSize(object):
+    """
+    Chooses the size of the next page so that fetching it takes about target_time seconds
+    and its body is at most max_bytes long judging by the previous page.
+
+    The size changes at most twice or by half at a time to damp the noise of the latency.
+    """
+    def __init__(self, size, target_time, min_size, max_size, max_bytes=None):
+        self.target_time = target_time
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size = max(min_size, min(max_size, size))
+
+    def update(self, count, elapsed, size_bytes=None):
+        """
+        :param count: the number of results of the page fetched
+        :param elapsed: the seconds it took to fetch the page
+        :param size_bytes: the length of the page body if known
+        """
+        if count <= 0 or elapsed <= 0:
+            return self.size
+        ideal = count * self.target_time / elapsed
+        if self.max_bytes and size_bytes:
+            ideal = min(ideal, count * float(self.max_bytes) / size_bytes)
+        ideal = max(self.size / 2.0, min(self.size * 2.0, ideal))
+        self.size = int(max(self.min_size, min(self.max_size, ideal)))
+        return self.size
+
+
+def offset_page_urls(next_url, count):
+    """
+    Returns the URLs of all the remaining pages starting with next_url
+    or None if they can't be derived from next_url because it doesn't contain both offset and limit
+    (e.g. when using CursorPagination) or count is unknown.
+    """
+    query = urlparse.parse_qs(urlparse.urlparse(next_url).query)
+    try:
+        offset = int(query['offset'][0])
+        limit = int(query['limit'][0])
+    except (KeyError, ValueError):
+        return None
+    if count is None or limit <= 0:
+        return None
+    return [extend_url_query_string(next_url, {'offset': page_offset})
+            for page_offset in range(offset, count, limit)]
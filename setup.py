@@ -36,6 +36,8 @@ setup(
     ],
     extras_require={
         'test': ['mock', 'pytest'],
+        'simplejson': ['simplejson'],
+        'ujson': ['ujson'],
     },
 
     license='BSD-3',
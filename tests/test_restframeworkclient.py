@@ -24,20 +24,53 @@ ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
+import io
+import json
+import math
+import pickle
+import array
+import six
 import mock
+import zlib
+import decimal
+import datetime
+import urlparse
+import threading
 import unittest
 
+import pytest
+
+from django.conf.urls import url
 from django.http.response import Http404
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+import requests
+import dateutil.tz
+import dateutil.parser
 
 import restframeworkclient
-from restframeworkclient.utils import extend_url_query_string, Indexable
+from restframeworkclient import batching, columns, compact, compression, concurrency, fields, hedging, jsoncodecs, lookups, \
+    local, querylog, ratelimiting, unitofwork, connection
+from restframeworkclient.streaming import StreamedPage
+from restframeworkclient.local import BatchView
+from restframeworkclient.testing import RESTFrameworkClientTestMixin
+from restframeworkclient.unitofwork import unit_of_work
+from restframeworkclient.middleware import get_request, set_request, RESTFrameworkClientQueryLogMiddleware, \
+    RESTFrameworkClientUnitOfWorkMiddleware
+from restframeworkclient.utils import extend_url_query_string, AdaptivePageSize, Indexable
 
 
 class Customer(restframeworkclient.Model):
+    merge = restframeworkclient.Method('merge', 'POST')
+
     class Meta:
         resource = 'customers'
         base_url = 'http://example.org'
         get_latest_by = 'created_at'
+        content_type = 'crm_customer'
 
 
 class Device(restframeworkclient.Model):
@@ -47,6 +80,44 @@ class Device(restframeworkclient.Model):
     class Meta:
         resource = 'devices'
         base_url = 'http://example.org'
+        content_type = 'inventory_device'
+
+
+class Memo(restframeworkclient.Model):
+    content_type = restframeworkclient.ContentTypeField()
+    content_object = restframeworkclient.GenericRelationField('content_type', 'object_id')
+
+    class Meta:
+        resource = 'memos'
+        base_url = 'http://example.org'
+
+
+class Invoice(restframeworkclient.Model):
+    customer = restframeworkclient.Reference('Customer', related_name='invoices')
+    amount = restframeworkclient.Field('amount')
+    paid_at = restframeworkclient.DateTimeField()
+
+    class Meta:
+        resource = 'invoices'
+        base_url = 'http://example.org'
+
+
+class CompactInvoice(restframeworkclient.Model):
+    customer = restframeworkclient.Reference('Customer')
+    amount = restframeworkclient.Field('amount')
+    paid_at = restframeworkclient.DateTimeField()
+
+    class Meta:
+        resource = 'invoices'
+        base_url = 'http://example.org'
+        compact = True
+
+
+class Tag(restframeworkclient.Model):
+    class Meta:
+        resource = 'tags'
+        base_url = 'http://example.org'
+        bulk_endpoint = 'bulk'
 
 
 class RequestManager(restframeworkclient.Manager):
@@ -65,6 +136,36 @@ class Request(restframeworkclient.Model):
         base_url = 'http://example.org'
 
 
+class LocalCustomerView(APIView):
+    authentication_classes = ()
+    permission_classes = ()
+
+    def get(self, request, pk):
+        if pk == '404':
+            raise Http404
+        return Response({'id': int(pk), 'params': request.query_params.dict()})
+
+    def patch(self, request, pk):
+        return Response({'id': int(pk), 'data': request.data.dict()})
+
+
+class LocalDeviceListView(APIView):
+    authentication_classes = ()
+    permission_classes = ()
+
+    def get(self, request):
+        customer = int(request.query_params['customer'])
+        return Response({'count': 1, 'next': None, 'previous': None,
+                         'results': [{'id': customer * 10, 'customer': customer}]})
+
+
+urlpatterns = [
+    url(r'^example-org/customers/(?P<pk>\d+)/$', LocalCustomerView.as_view()),
+    url(r'^example-org/devices/$', LocalDeviceListView.as_view()),
+    url(r'^example-org/batch/$', BatchView.as_view()),
+]
+
+
 class ModelSimpleTest(unittest.case.TestCase):
 
     def setUp(self):
@@ -244,6 +345,82 @@ class ModelTest(unittest.case.TestCase):
         }
         assert Customer.objects.exists() == False
 
+    @mock.patch('restframeworkclient.filtering.PartiallyFiltered._instance')
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_exists_does_not_create_instances(self, rest_call_mock, instance_mock):
+        rest_call_mock.return_value = {'count': 2, 'next': None, 'previous': None, 'results': [{'id': 1}]}
+        assert Customer.objects.filter(param='value').exists()
+        assert instance_mock.call_count == 0
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_count_reuses_count_of_fetched_results(self, rest_call_mock):
+        rest_call_mock.return_value = {'count': 2, 'next': None, 'previous': None, 'results': [{'id': 1}, {'id': 2}]}
+        customers = Customer.objects.filter(param='value')
+        list(customers)
+        assert customers.count() == 2
+        assert customers.exists()
+        assert rest_call_mock.call_count == 1
+        assert Customer.objects.none().count() == 0
+        assert rest_call_mock.call_count == 1
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_exists_of_sliced_queryset_keeps_offset(self, rest_call_mock):
+        def rest_call(url, params=None):
+            results = [{'id': 1}, {'id': 2}, {'id': 3}][params.get('offset', 0):]
+            return {'count': 3, 'next': None, 'previous': None, 'results': results[:params.get('limit')]}
+        rest_call_mock.side_effect = rest_call
+        customers = Customer.objects.all()[10:]
+        assert list(customers.iterator()) == []
+        assert not customers.exists()
+        rest_call_mock.assert_called_with('http://example.org/customers/', params={'offset': 10, 'limit': 1})
+        with override_settings(REST_FRAMEWORK_CLIENT={'COUNT': {'MODE': 'limit_zero'}}):
+            assert not Customer.objects.all()[10:].exists()
+            assert Customer.objects.all()[2:].exists()
+            assert not Customer.objects.all()[1:1].exists()
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_fetched_results_are_reused(self, rest_call_mock):
+        rest_call_mock.return_value = {
+            'count': 4,
+            'next': None,
+            'previous': None,
+            'results': [{'id': 1}, {'id': 2}, {'id': 3}, {'id': 4}],
+        }
+        customers = Customer.objects.filter(param='value')
+        customers[0]
+        assert rest_call_mock.call_count == 1
+        customers[1]
+        assert rest_call_mock.call_count == 2
+        list(customers)
+        assert rest_call_mock.call_count == 3
+        assert [customer.pk for customer in customers[1:3]] == [2, 3]
+        assert [customer.pk for customer in customers[::2]] == [1, 3]
+        assert customers[1:3].count() == 4
+        assert customers[3].pk == 4
+        assert customers[4] is None
+        assert customers.first().pk == 1
+        assert customers.last().pk == 4
+        assert customers.exists()
+        assert customers.count() == 4
+        assert len(customers) == 4
+        assert rest_call_mock.call_count == 3
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_count_modes(self, rest_call_mock):
+        rest_call_mock.return_value = {'count': 3, 'next': None, 'previous': None, 'results': []}
+        with override_settings(REST_FRAMEWORK_CLIENT={'COUNT': {'MODE': 'limit_zero'}}):
+            assert Customer.objects.filter(param='value').count() == 3
+            rest_call_mock.assert_called_with('http://example.org/customers/', params={'param': 'value', 'limit': 0})
+        with override_settings(REST_FRAMEWORK_CLIENT={'COUNT': {'MODE': 'param', 'PARAM': 'only_count'}}):
+            assert Customer.objects.filter(param='value').count() == 3
+            rest_call_mock.assert_called_with('http://example.org/customers/',
+                                              params={'param': 'value', 'only_count': 1})
+        with override_settings(REST_FRAMEWORK_CLIENT={'COUNT': {'MODE': 'head'}}):
+            rest_call_mock.return_value = {'X-Total-Count': '5'}
+            assert Customer.objects.filter(param='value').count() == 5
+            rest_call_mock.assert_called_with('http://example.org/customers/', method='HEAD',
+                                              params={'param': 'value', 'limit': 1})
+
     @mock.patch('restframeworkclient.Model._rest_call')
     def test_save_populates_pk(self, rest_call_mock):
         rest_call_mock.return_value = {
@@ -273,6 +450,27 @@ class ModelTest(unittest.case.TestCase):
         customer.save()
         rest_call_mock.assert_called_with('http://example.org/customers/123/', data={'email': 'b@b.com'}, method='PATCH')
 
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_save_with_json_request_format(self, rest_call_mock):
+        rest_call_mock.return_value = {'id': 123, 'name': 'name', 'address': {'city': 'Bratislava'}}
+        with override_settings(REST_FRAMEWORK_CLIENT={'REQUEST_FORMAT': 'json'}):
+            customer = Customer(name='name', address={'city': 'Bratislava'})
+            customer.save()
+            rest_call_mock.assert_called_with('http://example.org/customers/', method='POST',
+                                              json={'name': 'name', 'address': {'city': 'Bratislava'}})
+            customer.address = {'city': 'Wien'}
+            customer.save()
+            rest_call_mock.assert_called_with('http://example.org/customers/123/', method='PATCH',
+                                              json={'address': {'city': 'Wien'}})
+            customer.merge(into=Customer(id=1), data={'a': [1]})
+            rest_call_mock.assert_called_with('http://example.org/customers/123/merge/', method='POST',
+                                              json={'into': 1, 'data': {'a': [1]}})
+            Device(customer=customer, image=io.BytesIO(b'image')).save()
+            assert 'data' in rest_call_mock.call_args[1]
+        customer.merge(into=Customer(id=1), data={'a': [1]})
+        rest_call_mock.assert_called_with('http://example.org/customers/123/merge/', method='POST',
+                                          data={'into': 1, 'data': '{"a": [1]}'})
+
     @mock.patch('restframeworkclient.Model._rest_call')
     def test_reverse_reference_query(self, rest_call_mock):
         rest_call_mock.return_value = {
@@ -693,3 +891,1016 @@ class IndexableTest(unittest.case.TestCase):
         assert next(it2) == 2
 
         assert next(it1) == 2
+
+
+class HedgingTest(unittest.case.TestCase):
+    def setUp(self):
+        hedging.reset_stats()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def slow_then_fast(self):
+        calls = []
+
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                self.release.wait(5)
+                return 'slow'
+            return 'fast'
+        return send
+
+    def test_hedge_wins_when_first_request_is_slow(self):
+        assert hedging.hedged_call(self.slow_then_fast(), delay=0.01, max_rate=1) == 'fast'
+        assert hedging.stats == {'requests': 1, 'hedges_sent': 1, 'hedges_won': 1}
+
+    def test_no_hedge_when_first_request_is_fast(self):
+        assert hedging.hedged_call(lambda: 'fast', delay=5, max_rate=1) == 'fast'
+        assert hedging.stats == {'requests': 1, 'hedges_sent': 0, 'hedges_won': 0}
+
+    def test_hedge_rate_is_capped(self):
+        send = self.slow_then_fast()
+        threading.Timer(0.05, self.release.set).start()
+        assert hedging.hedged_call(send, delay=0.01, max_rate=0) == 'slow'
+        assert hedging.stats == {'requests': 1, 'hedges_sent': 0, 'hedges_won': 0}
+
+    def test_may_hedge_is_not_consulted_over_rate_cap(self):
+        may_hedge = mock.Mock(return_value=True)
+        threading.Timer(0.05, self.release.set).start()
+        assert hedging.hedged_call(self.slow_then_fast(), delay=0.01, max_rate=0, may_hedge=may_hedge) == 'slow'
+        assert may_hedge.call_count == 0
+
+    def test_reserved_hedge_is_released_when_may_hedge_refuses(self):
+        threading.Timer(0.05, self.release.set).start()
+        assert hedging.hedged_call(self.slow_then_fast(), delay=0.01, max_rate=1, may_hedge=lambda: False) == 'slow'
+        assert hedging.stats == {'requests': 1, 'hedges_sent': 0, 'hedges_won': 0}
+
+    def test_failed_request_does_not_win_over_request_in_flight(self):
+        calls = []
+
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                self.release.wait(5)
+                raise ValueError
+            return 'hedge'
+        assert hedging.hedged_call(send, delay=0.01, max_rate=1) == 'hedge'
+
+    def test_losing_result_is_discarded(self):
+        discarded = threading.Event()
+        send = self.slow_then_fast()
+        assert hedging.hedged_call(send, delay=0.01, max_rate=1, discard=lambda result: discarded.set()) == 'fast'
+        assert not discarded.is_set()
+        self.release.set()
+        assert discarded.wait(5)
+
+    def test_worker_threads_are_reused(self):
+        hedging.hedged_call(lambda: 'warm up', delay=0.01, max_rate=1)
+        for _ in range(100):
+            # The call and its timer
+            if len(hedging._idle_workers) >= 2:
+                break
+            threading.Event().wait(0.01)
+        with mock.patch.object(hedging._Worker, 'start') as start_mock:
+            assert hedging.hedged_call(lambda: 'fast', delay=0.01, max_rate=1) == 'fast'
+        assert start_mock.call_count == 0
+
+    def test_outcome_is_waited_for_without_timeout(self):
+        get = hedging.queue.Queue.get
+        with mock.patch.object(hedging.queue.Queue, 'get', autospec=True, side_effect=get) as get_mock:
+            assert hedging.hedged_call(self.slow_then_fast(), delay=0.01, max_rate=1) == 'fast'
+            assert hedging.hedged_call(lambda: 'fast', delay=5, max_rate=1) == 'fast'
+        # The worker threads wait for their tasks by Queue.get as well
+        assert get_mock.call_count >= 3
+        assert all(call == mock.call(mock.ANY) for call in get_mock.call_args_list)
+
+
+@mock.patch('restframeworkclient.ratelimiting.time')
+class RateLimitingTest(unittest.case.TestCase):
+    def test_token_bucket_paces_after_burst(self, time_mock):
+        time_mock.time.return_value = 100.0
+        bucket = ratelimiting.TokenBucket(rate=10, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        assert time_mock.sleep.call_count == 0
+        bucket.acquire()
+        time_mock.sleep.assert_called_with(0.1)
+        assert not bucket.try_acquire()
+        time_mock.time.return_value = 100.5
+        assert bucket.try_acquire()
+
+    @override_settings(REST_FRAMEWORK_CLIENT={'RATE_LIMITS': {'http://example.org': (5, 1)}})
+    def test_buckets_are_shared_per_base_url(self, time_mock):
+        time_mock.time.return_value = 200.0
+        ratelimiting.throttle(Customer)
+        ratelimiting.throttle(Device)
+        time_mock.sleep.assert_called_once_with(0.2)
+
+    def test_tokens_are_refunded_when_another_bucket_refuses(self, time_mock):
+        time_mock.time.return_value = 300.0
+        available, exhausted = ratelimiting.TokenBucket(rate=1), ratelimiting.TokenBucket(rate=1)
+        exhausted.acquire()
+        with mock.patch('restframeworkclient.ratelimiting._get_buckets', return_value=[available, exhausted]):
+            assert not ratelimiting.try_throttle(Customer)
+        assert available.try_acquire()
+
+
+class LocalRestFrameworkTest(unittest.case.TestCase):
+    def local_settings(self, transport):
+        return override_settings(
+            ROOT_URLCONF=__name__,
+            ALLOWED_HOSTS=['testserver'],
+            MIDDLEWARE=[],
+            REST_FRAMEWORK_CLIENT={
+                'USE_LOCAL_REST_FRAMEWORK': True,
+                'LOCAL_TRANSPORT': transport,
+                'BASE_URLS': {'example-org': 'http://example.org', 'other': 'http://example.com'},
+            },
+        )
+
+    def test_transports_return_the_same_data(self):
+        for transport in ['client', 'dispatch']:
+            with self.local_settings(transport):
+                assert Customer._execute_rest_call('http://example.org/customers/1/', 'GET', params={'a': 'b'}) == \
+                    {'id': 1, 'params': {'a': 'b'}}
+                assert Customer._execute_rest_call('http://example.org/customers/1/', 'PATCH', data={'c': 'd'}) == \
+                    {'id': 1, 'data': {'c': 'd'}}
+
+    def test_transports_handle_status_codes(self):
+        for transport in ['client', 'dispatch']:
+            with self.local_settings(transport):
+                with self.assertRaises(Customer.DoesNotExist):
+                    Customer._execute_rest_call('http://example.org/customers/404/', 'GET')
+                with self.assertRaises(Customer.DoesNotExist):
+                    Customer._execute_rest_call('http://example.org/unknown/', 'GET')
+
+    def test_api_prefix_is_the_longest_matching_base_url(self):
+        base_urls = {'org': 'http://example.org', 'org-v1': 'http://example.org/v1/', 'org-v': 'http://example.org/v',
+                     'com': 'http://example.com/api'}
+        with override_settings(REST_FRAMEWORK_CLIENT={'BASE_URLS': base_urls}):
+            assert local.get_api_prefix('http://example.org/v1/customers/1/?a=b') == 'org-v1'
+            assert local.get_api_prefix('http://example.org/v1') == 'org-v1'
+            assert local.get_api_prefix('http://example.org/customers/1/') == 'org'
+            # Base URLs not ending at a slash of the url are found by the fallback scan
+            assert local.get_api_prefix('http://example.org/v2/customers/') == 'org-v'
+            assert local.get_api_prefix('http://example.com/apis/') == 'com'
+            assert local.get_api_prefix('http://example.com/customers/') is None
+        with override_settings(REST_FRAMEWORK_CLIENT={'BASE_URLS': {'com': 'http://example.com'}}):
+            assert local.get_api_prefix('http://example.com/customers/') == 'com'
+            assert local.get_api_prefix('http://example.org/v1/customers/') is None
+
+
+class BatchingTest(unittest.case.TestCase):
+    def local_settings(self, transport, **options):
+        return override_settings(
+            ROOT_URLCONF=__name__,
+            ALLOWED_HOSTS=['testserver'],
+            MIDDLEWARE=[],
+            REST_FRAMEWORK_CLIENT={
+                'USE_LOCAL_REST_FRAMEWORK': True,
+                'LOCAL_TRANSPORT': transport,
+                'BASE_URLS': {'example-org': 'http://example.org'},
+                'BATCH_REQUESTS': {'http://example.org': options},
+            },
+        )
+
+    @mock.patch('restframeworkclient.batching._send', wraps=batching._send)
+    def test_concurrent_calls_are_sent_together(self, send_mock):
+        for transport in ['client', 'dispatch']:
+            send_mock.reset_mock()
+            with self.local_settings(transport, MAX_SIZE=3):
+                with batching.batch(window=5):
+                    futures = [concurrency.submit(Customer._execute_rest_call, 'http://example.org/customers/%s/' % pk,
+                                                  'GET')
+                               for pk in [1, 404, 2]]
+                    assert futures[0].result(5) == {'id': 1, 'params': {}}
+                    assert futures[2].result(5) == {'id': 2, 'params': {}}
+                    assert isinstance(futures[1].exception(5), Customer.DoesNotExist)
+            assert send_mock.call_count == 1
+
+    @mock.patch('restframeworkclient.batching._send', wraps=batching._send)
+    def test_call_of_block_owner_is_sent_immediately(self, send_mock):
+        with self.local_settings('dispatch'):
+            with batching.batch(window=5):
+                assert Customer._execute_rest_call('http://example.org/customers/1/', 'GET', params={'a': 'b'}) == \
+                    {'id': 1, 'params': {'a': 'b'}}
+            assert send_mock.call_count == 1
+            assert Customer._execute_rest_call('http://example.org/customers/2/', 'GET') == {'id': 2, 'params': {}}
+            assert send_mock.call_count == 1
+
+    @mock.patch('restframeworkclient.batching._send', wraps=batching._send)
+    def test_calls_are_batched_over_window(self, send_mock):
+        with self.local_settings('dispatch', WINDOW=0.01):
+            assert Customer._execute_rest_call('http://example.org/customers/1/', 'GET') == {'id': 1, 'params': {}}
+        assert send_mock.call_count == 1
+
+
+class ConcurrencyTest(unittest.case.TestCase):
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_aget(self, rest_call_mock):
+        rest_call_mock.return_value = {'id': 1}
+        future = Customer.objects.aget(pk=1)
+        assert future.result().pk == 1
+        rest_call_mock.assert_called_with('http://example.org/customers/1/')
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_future_reraises_exception(self, rest_call_mock):
+        rest_call_mock.side_effect = Customer.DoesNotExist
+        future = Customer.objects.aget(pk=1)
+        with self.assertRaises(Customer.DoesNotExist):
+            future.result()
+
+    def test_submitted_calls_share_current_request(self):
+        request = object()
+        set_request(request)
+        self.addCleanup(set_request, None)
+        assert concurrency.submit(get_request).result() is request
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_aiterator_fetches_pages_by_offset(self, rest_call_mock):
+        def rest_call(url, params=None):
+            if params is not None:
+                offset = 0
+                next_url = 'http://example.org/customers/?a=1&limit=2&offset=2'
+            else:
+                offset = int(urlparse.parse_qs(urlparse.urlparse(url).query)['offset'][0])
+                next_url = None
+            return {
+                'count': 5,
+                'next': next_url,
+                'previous': None,
+                'results': [{'id': i + 1} for i in range(offset, min(offset + 2, 5))],
+            }
+        rest_call_mock.side_effect = rest_call
+        assert [customer.pk for customer in Customer.objects.filter(a=1).aiterator()] == [1, 2, 3, 4, 5]
+        assert rest_call_mock.call_count == 3
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_eager_prefetch_related_fetches_relations_concurrently(self, rest_call_mock):
+        invoices_requested = threading.Event()
+
+        def rest_call(url, params=None):
+            if url == 'http://example.org/customers/':
+                results = [{'id': 1}, {'id': 2}]
+            elif url == 'http://example.org/devices/':
+                assert invoices_requested.wait(5)
+                results = [{'id': 11, 'customer': 1}, {'id': 21, 'customer': 2}]
+            else:
+                invoices_requested.set()
+                results = [{'id': 12, 'customer': 1}]
+            return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+        rest_call_mock.side_effect = rest_call
+
+        customers = list(Customer.objects.all().prefetch_related('devices', 'invoices', eager=True))
+        assert rest_call_mock.call_count == 3
+        rest_call_mock.assert_any_call('http://example.org/devices/', params={'customer__in': [1, 2]})
+        rest_call_mock.assert_any_call('http://example.org/invoices/', params={'customer__in': [1, 2]})
+        assert [device.pk for device in customers[1].devices.all()] == [21]
+        assert [invoice.pk for invoice in customers[0].invoices.all()] == [12]
+        assert list(customers[1].invoices.all()) == []
+        assert rest_call_mock.call_count == 3
+
+
+class GenericRelationTest(unittest.case.TestCase):
+    def test_model_by_content_type(self):
+        assert restframeworkclient.fields._get_model_by_content_type('crm_customer') is Customer
+        assert restframeworkclient.fields._get_model_by_content_type('unknown') is None
+
+    def test_subclass_inheriting_meta_does_not_replace_model_by_content_type(self):
+        class SpecialCustomer(Customer):
+            pass
+        assert SpecialCustomer.Meta.content_type == 'crm_customer'
+        assert restframeworkclient.fields._get_model_by_content_type('crm_customer') is Customer
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_prefetch_related_groups_by_content_type(self, rest_call_mock):
+        def rest_call(url, params=None):
+            results = {
+                'http://example.org/memos/': [
+                    {'id': 1, 'content_type': 'crm_customer', 'object_id': 10},
+                    {'id': 2, 'content_type': 'inventory_device', 'object_id': 20},
+                    {'id': 3, 'content_type': 'crm_customer', 'object_id': 11},
+                    {'id': 4, 'content_type': 'crm_customer', 'object_id': 10},
+                ],
+                'http://example.org/customers/': [{'id': 10}, {'id': 11}],
+                'http://example.org/devices/': [{'id': 20}],
+            }[url]
+            return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+        rest_call_mock.side_effect = rest_call
+
+        memos = Memo.objects.all().prefetch_related('content_object')
+        assert [(type(memo.content_object), memo.content_object.pk) for memo in memos] == [
+            (Customer, 10), (Device, 20), (Customer, 11), (Customer, 10),
+        ]
+        assert rest_call_mock.call_count == 3
+        rest_call_mock.assert_any_call('http://example.org/customers/', params={'id__in': [10, 11]})
+        rest_call_mock.assert_any_call('http://example.org/devices/', params={'id__in': [20]})
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_field_assigned_after_class_creation(self, rest_call_mock):
+        class Note(Memo):
+            pass
+        Note.attached_object = restframeworkclient.GenericRelationField('content_type', 'object_id')
+        rest_call_mock.side_effect = [
+            {'count': 1, 'next': None, 'previous': None,
+             'results': [{'id': 1, 'content_type': 'crm_customer', 'object_id': 10}]},
+            {'id': 10},
+        ]
+        note = Note.objects.all()[0]
+        assert note.attached_object.pk == 10
+        rest_call_mock.assert_called_with('http://example.org/customers/10/')
+
+
+class PaginationTest(unittest.case.TestCase):
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_cursor_pagination(self, rest_call_mock):
+        def rest_call(url, params=None):
+            if params is not None:
+                return {'next': 'http://example.org/customers/?cursor=abc', 'previous': None,
+                        'results': [{'id': 1}, {'id': 2}]}
+            return {'next': None, 'previous': url, 'results': [{'id': 3}, {'id': 4}]}
+        rest_call_mock.side_effect = rest_call
+        with override_settings(REST_FRAMEWORK_CLIENT={'PAGINATION': {'MODE': 'cursor'}}):
+            customers = Customer.objects.filter(a=1)
+            assert [customer.pk for customer in customers[1:3]] == [2, 3]
+            rest_call_mock.assert_any_call('http://example.org/customers/', params={'a': 1})
+            assert [customer.pk for customer in customers.iterator()] == [1, 2, 3, 4]
+            assert customers.count() == 4
+            with self.assertRaises(restframeworkclient.MultipleObjectsReturned):
+                customers.get()
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_cursor_pagination_count_modes_and_exists(self, rest_call_mock):
+        def rest_call(url, params=None, method='GET'):
+            if method == 'HEAD':
+                return {'X-Total-Count': '4'}
+            if params is not None and 'count_only' in params:
+                return {'count': 4}
+            if params is not None:
+                return {'next': 'http://example.org/customers/?cursor=abc', 'previous': None,
+                        'results': [{'id': 1}, {'id': 2}]}
+            return {'next': None, 'previous': url, 'results': [{'id': 3}, {'id': 4}]}
+        rest_call_mock.side_effect = rest_call
+        for mode in ['head', 'param', 'limit_zero']:
+            with override_settings(REST_FRAMEWORK_CLIENT={'PAGINATION': {'MODE': 'cursor'}, 'COUNT': {'MODE': mode}}):
+                rest_call_mock.reset_mock()
+                assert Customer.objects.filter(a=1).exists()
+                assert rest_call_mock.call_count == 1
+                assert Customer.objects.filter(a=1).count() == 4
+                assert rest_call_mock.call_count == (2 if mode != 'limit_zero' else 3)
+                assert Customer.objects.filter(a=1)[3:].exists()
+                assert not Customer.objects.filter(a=1)[4:].exists()
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_keyset_pagination(self, rest_call_mock):
+        def rest_call(url, params):
+            remaining = [pk for pk in range(1, 6) if pk > params.get('id__gt', 0)]
+            return {
+                'count': len(remaining),
+                'next': 'http://example.org/customers/?next' if len(remaining) > params['limit'] else None,
+                'previous': None,
+                'results': [{'id': pk} for pk in remaining[:params['limit']]],
+            }
+        rest_call_mock.side_effect = rest_call
+        with override_settings(REST_FRAMEWORK_CLIENT={'PAGINATION': {'MODE': 'keyset', 'PAGE_SIZE': 2}}):
+            customers = Customer.objects.filter(a=1)
+            assert [customer.pk for customer in customers.iterator()] == [1, 2, 3, 4, 5]
+            assert rest_call_mock.mock_calls == [
+                mock.call('http://example.org/customers/', params={'a': 1, 'ordering': 'id', 'limit': 2}),
+                mock.call('http://example.org/customers/', params={'a': 1, 'ordering': 'id', 'limit': 2, 'id__gt': 2}),
+                mock.call('http://example.org/customers/', params={'a': 1, 'ordering': 'id', 'limit': 2, 'id__gt': 4}),
+            ]
+            assert [customer.pk for customer in customers[2:3]] == [3]
+            assert rest_call_mock.call_count == 5
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_page_size_does_not_limit_results(self, rest_call_mock):
+        def rest_call(url, params=None):
+            if params is None:
+                query = urlparse.parse_qs(urlparse.urlparse(url).query)
+                params = {'offset': int(query['offset'][0]), 'limit': int(query['limit'][0])}
+            offset = params.get('offset', 0)
+            stop = min(offset + params['limit'], 5)
+            return {
+                'count': 5,
+                'next': 'http://example.org/customers/?limit=%s&offset=%s' % (params['limit'], stop)
+                if stop < 5 else None,
+                'previous': None,
+                'results': [{'id': pk} for pk in range(offset + 1, stop + 1)],
+            }
+        rest_call_mock.side_effect = rest_call
+        customers = Customer.objects.filter(a=1).page_size(2)
+        assert [customer.pk for customer in customers] == [1, 2, 3, 4, 5]
+        rest_call_mock.assert_any_call('http://example.org/customers/', params={'a': 1, 'limit': 2})
+        assert rest_call_mock.call_count == 3
+        assert [customer.pk for customer in customers.page_size(3)[1:5]] == [2, 3, 4, 5]
+        rest_call_mock.assert_any_call('http://example.org/customers/', params={'a': 1, 'offset': 1, 'limit': 3})
+        assert rest_call_mock.call_count == 5
+
+    def test_adaptive_page_size(self):
+        page_size = AdaptivePageSize(100, target_time=0.5, min_size=10, max_size=1000, max_bytes=10000)
+        assert page_size.update(100, 0.1) == 200
+        assert page_size.update(200, 0.4) == 250
+        assert page_size.update(250, 1.0) == 125
+        assert page_size.update(125, 0.1, size_bytes=25000) == 62
+        assert page_size.update(0, 0.1) == 62
+
+
+class LookupsTest(unittest.case.TestCase):
+    def invoices(self):
+        return [
+            Invoice(id=1, customer=1, amount=10, paid_at='2017-01-01T10:00:00'),
+            Invoice(id=2, customer=1, amount=30, paid_at=None),
+            Invoice(id=3, customer=2, amount=20, paid_at='2017-01-03T10:00:00'),
+        ]
+
+    def evaluate(self, **params):
+        results = lookups.evaluate(Invoice, self.invoices(), params)
+        return None if results is None else [invoice.pk for invoice in results]
+
+    def test_lookups(self):
+        assert self.evaluate(customer=1) == [1, 2]
+        assert self.evaluate(customer=Customer(id=2)) == [3]
+        assert self.evaluate(pk__in=[1, 3]) == [1, 3]
+        assert self.evaluate(amount__gte='20') == [2, 3]
+        assert self.evaluate(amount__lt=20, customer__in='1,2') == [1]
+        assert self.evaluate(paid_at__isnull=True) == [2]
+        assert self.evaluate(paid_at__gt='2017-01-02') == [3]
+        assert self.evaluate(ordering='-amount') == [2, 3, 1]
+        assert self.evaluate(ordering='customer,-amount') == [2, 1, 3]
+        assert self.evaluate(ordering='paid_at') == [1, 3, 2]
+        assert self.evaluate(ordering='-paid_at') == [2, 3, 1]
+
+    def test_unsupported_params(self):
+        assert self.evaluate(status='paid') is None
+        assert self.evaluate(amount__range=[1, 2]) is None
+        assert self.evaluate(ordering='status') is None
+        assert self.evaluate(select_related='customer') is None
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_filtering_prefetched_relation(self, rest_call_mock):
+        def rest_call(url, params=None):
+            if url == 'http://example.org/customers/':
+                results = [{'id': 1}, {'id': 2}]
+            else:
+                results = [{'id': 11, 'customer': 1, 'amount': 5, 'paid_at': None},
+                           {'id': 12, 'customer': 1, 'amount': 15, 'paid_at': None},
+                           {'id': 21, 'customer': 2, 'amount': 25, 'paid_at': None}]
+            return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+        rest_call_mock.side_effect = rest_call
+
+        customers = list(Customer.objects.all().prefetch_related('invoices'))
+        invoices = customers[0].invoices.filter(amount__gt=1).order_by('-amount')
+        assert [invoice.pk for invoice in invoices] == [12, 11]
+        assert invoices.count() == 2
+        assert rest_call_mock.call_count == 2
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_unsupported_filter_of_prefetched_relation_does_not_fetch_it(self, rest_call_mock):
+        def rest_call(url, params=None):
+            if url == 'http://example.org/customers/':
+                results = [{'id': 1}, {'id': 2}]
+            else:
+                results = [{'id': 11, 'customer': params['customer'], 'status': 'paid'}]
+            return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+        rest_call_mock.side_effect = rest_call
+
+        customers = list(Customer.objects.all().prefetch_related('invoices'))
+        assert [invoice.pk for invoice in customers[0].invoices.filter(status='paid')] == [11]
+        assert rest_call_mock.call_count == 2
+        rest_call_mock.assert_called_with('http://example.org/invoices/', params={'customer': 1, 'status': 'paid'})
+
+        list(customers[0].invoices.filter(status='paid'))
+        rest_call_mock.assert_called_with('http://example.org/invoices/', params={'customer': 1, 'status': 'paid'})
+
+
+class DateParsingTest(unittest.case.TestCase):
+    def test_iso_8601_fast_path(self):
+        for value in ['2016-08-24T00:34:26.5+02:00', '2016-08-24 00:34:26.123456789-0530', '2016-08-24T00:34',
+                      '2016-08-24T00:34:26Z', 'Aug 24 2016 00:34']:
+            assert fields.parse_datetime(value) == dateutil.parser.parse(value)
+        assert fields.parse_datetime('2016-08-24T00:34:26Z').tzinfo == dateutil.tz.tzutc()
+        assert fields.parse_date('2016-08-24') == datetime.date(2016, 8, 24)
+        assert fields.parse_time('10:20:30.25') == datetime.time(10, 20, 30, 250000)
+
+    @mock.patch('restframeworkclient.fields.parse_datetime', wraps=fields.parse_datetime)
+    def test_parsed_values_are_cached(self, parse_mock):
+        invoice = Invoice(paid_at='2017-01-02T03:04:05Z')
+        assert invoice.paid_at == invoice.paid_at == datetime.datetime(2017, 1, 2, 3, 4, 5, tzinfo=dateutil.tz.tzutc())
+        assert parse_mock.call_count == 1
+        invoice.paid_at = '2017-01-03T03:04:05Z'
+        assert invoice.paid_at.day == 3
+        invoice._set_saved_attrs({'paid_at': '2017-01-04T03:04:05Z'})
+        assert invoice.paid_at.day == 4
+        assert parse_mock.call_count == 3
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    @mock.patch('restframeworkclient.fields.parse_datetime', wraps=fields.parse_datetime)
+    def test_eager_parsing(self, parse_mock, rest_call_mock):
+        rest_call_mock.return_value = {
+            'count': 3,
+            'next': None,
+            'previous': None,
+            'results': [{'id': 1, 'paid_at': '2017-01-02T03:04:05Z'}, {'id': 2, 'paid_at': None},
+                        {'id': 3, 'paid_at': '2017-01-02T03:04:05Z'}],
+        }
+        with override_settings(REST_FRAMEWORK_CLIENT={'EAGER_PARSING': True}):
+            invoices = list(Invoice.objects.all())
+        assert parse_mock.call_count == 1
+        assert [invoice.paid_at for invoice in invoices] == [invoices[0].paid_at, None, invoices[0].paid_at]
+        assert parse_mock.call_count == 1
+
+
+class ColumnsTest(unittest.case.TestCase):
+    def rest_call(self, url, params=None):
+        if params is None:
+            params = {'offset': 2}
+        results = [
+            {'id': 1, 'customer': 10, 'amount': '1.5', 'paid_at': '2017-01-02T03:04:05+01:00'},
+            {'id': 2, 'customer': {'id': 20}, 'amount': None, 'paid_at': None},
+            {'id': 3, 'customer': 10, 'amount': '3', 'paid_at': '2017-01-03T00:00:00Z'},
+        ]
+        offset = params.get('offset', 0)
+        return {
+            'count': 3,
+            'next': 'http://example.org/invoices/?offset=2' if offset == 0 else None,
+            'previous': None,
+            'results': results[offset:offset + 2],
+        }
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_to_columns(self, rest_call_mock):
+        rest_call_mock.side_effect = self.rest_call
+        numpy = pytest.importorskip('numpy')
+        data = Invoice.objects.all().to_columns('pk', 'customer', 'amount', 'paid_at', dtypes={'amount': 'f8'})
+        assert list(data) == ['pk', 'customer', 'amount', 'paid_at']
+        assert data['pk'].tolist() == [1, 2, 3]
+        assert data['customer'].tolist() == [10, 20, 10]
+        assert data['amount'][0] == 1.5 and numpy.isnan(data['amount'][1])
+        assert data['paid_at'].dtype == numpy.dtype('datetime64[us]')
+        assert str(data['paid_at'][0]) == '2017-01-02T02:04:05.000000'
+        assert numpy.isnat(data['paid_at'][1])
+        assert Invoice.objects.all()[1:].to_columns('pk')['pk'].tolist() == [2, 3]
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_to_columns_without_numpy(self, rest_call_mock):
+        rest_call_mock.side_effect = self.rest_call
+        with mock.patch.object(columns, 'numpy', None):
+            data = Invoice.objects.all().to_columns('pk', 'amount', 'paid_at', dtypes={'pk': 'int64', 'amount': 'f8'})
+        assert data['pk'] == array.array('l', [1, 2, 3])
+        assert data['amount'][0] == 1.5 and math.isnan(data['amount'][1])
+        assert data['paid_at'][0] == 1483322645.0 and math.isnan(data['paid_at'][1])
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_integer_columns_with_none(self, rest_call_mock):
+        rest_call_mock.side_effect = self.rest_call
+        for numpy in ([None] if columns.numpy is None else [None, columns.numpy]):
+            with mock.patch.object(columns, 'numpy', numpy):
+                with self.assertRaises(ValueError) as context:
+                    Invoice.objects.all().to_columns('pk', 'amount', dtypes={'amount': 'int64'})
+                assert 'amount' in str(context.exception)
+
+
+class ExportTest(unittest.case.TestCase):
+    def rest_call(self, url, params=None):
+        offset = params.get('offset', 0) if params is not None else 2
+        results = [{'id': 1, 'customer': 10, 'amount': '1.5', 'note': u'\xe9'}, {'id': 2, 'customer': 20},
+                   {'id': 3, 'customer': 10, 'amount': '3', 'note': {'a': 1}}]
+        return {
+            'count': 3,
+            'next': 'http://example.org/invoices/?limit=2&offset=2' if offset == 0 else None,
+            'previous': None,
+            'results': results[offset:offset + 2],
+        }
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_export_jsonl(self, rest_call_mock):
+        rest_call_mock.side_effect = self.rest_call
+        fileobj = io.BytesIO()
+        assert Invoice.objects.all().export(fileobj, fields=['pk', 'amount']) == 3
+        assert fileobj.getvalue() == '{"pk": 1, "amount": "1.5"}\n{"pk": 2, "amount": null}\n{"pk": 3, "amount": "3"}\n'
+        fileobj = io.BytesIO()
+        assert Invoice.objects.all()[1:].export(fileobj, pages_ahead=2) == 2
+        assert [json.loads(line)['id'] for line in fileobj.getvalue().splitlines()] == [2, 3]
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_export_csv(self, rest_call_mock):
+        rest_call_mock.side_effect = self.rest_call
+        fileobj = io.BytesIO()
+        Invoice.objects.all().export(fileobj, format='csv', fields=['pk', 'customer', 'note'], pages_ahead=2)
+        assert fileobj.getvalue().splitlines() == ['pk,customer,note', '1,10,\xc3\xa9', '2,20,', '3,10,"{""a"": 1}"']
+        fileobj = io.BytesIO()
+        Invoice.objects.all().none().export(fileobj, format='csv', fields=['pk'])
+        assert fileobj.getvalue() == 'pk\r\n'
+        with self.assertRaises(ValueError):
+            Invoice.objects.all().export(fileobj, format='xml')
+
+
+class CompactStorageTest(unittest.case.TestCase):
+    def test_instances_are_stored_compactly(self):
+        invoice = CompactInvoice(id=1, amount='1.5', paid_at='2017-01-02T03:04:05Z', lines=[{'sku': 'a'}])
+        assert isinstance(invoice._attrs, compact.CompactAttrs)
+        assert invoice._attrs == {'id': 1, 'amount': '1.5', 'paid_at': '2017-01-02T03:04:05Z', 'lines': [{'sku': 'a'}]}
+        assert invoice.amount == '1.5' and invoice.lines == [{'sku': 'a'}] and invoice.paid_at.year == 2017
+        assert not hasattr(invoice, '__dict__') and '_cached_instance_paid_at' in invoice._field_cache
+        assert repr(invoice) == 'Compact' + repr(Invoice(id=1, amount='1.5', paid_at='2017-01-02T03:04:05Z', lines=[{'sku': 'a'}]))
+        assert invoice._attrs._index is CompactInvoice(id=2)._attrs._index
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_changes_are_saved(self, rest_call_mock):
+        invoice = CompactInvoice(id=1, amount='1.5', lines=[{'sku': 'a'}])
+        invoice._persisted = True
+        invoice.amount = '2'
+        invoice.lines[0]['sku'] = 'b'
+        assert invoice._changes == {'amount': '2', 'lines': [{'sku': 'b'}]}
+        rest_call_mock.return_value = {'id': 1, 'amount': '2', 'lines': [{'sku': 'b'}]}
+        invoice.save()
+        rest_call_mock.assert_called_once_with('http://example.org/invoices/1/', method='PATCH',
+                                               data={'amount': '2', 'lines': [{'sku': 'b'}]})
+        assert invoice._changes == {}
+        assert isinstance(invoice._original_attrs, compact.CompactAttrs)
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_instances_are_pickled(self, rest_call_mock):
+        rest_call_mock.return_value = {'count': 1, 'next': None, 'previous': None,
+                                       'results': [{'id': 1, 'amount': '1.5', 'paid_at': '2017-01-02T03:04:05Z'}]}
+        invoice = CompactInvoice.objects.filter(amount='1.5')[0]
+        invoice.amount = '2'
+        for protocol in (0, 2):
+            unpickled = pickle.loads(pickle.dumps(invoice, protocol))
+            assert unpickled._attrs == invoice._attrs and unpickled._changes == {'amount': '2'}
+            assert unpickled._persisted and unpickled.paid_at.year == 2017
+            assert unpickled._attrs._index is invoice._attrs._index
+        index = pickle.loads(pickle.dumps(compact.KeyIndex(['id', 'name']), 2))
+        assert index.keys == ['id', 'name'] and index.add('extra') == 2
+
+    def test_attrs_behave_like_dict(self):
+        index = compact.KeyIndex(['id'])
+        attrs = compact.CompactAttrs(index, {'id': 1, 'name': 'a'})
+        with mock.patch('restframeworkclient.compact.MAX_INDEX_SIZE', 2):
+            attrs['extra'] = 3
+        assert index.keys == ['id', 'name'] and attrs._extras == {'extra': 3}
+        assert attrs.items() == [('id', 1), ('name', 'a'), ('extra', 3)]
+        del attrs['name']
+        assert 'name' not in attrs and len(attrs) == 2 and attrs.get('name') is None
+        with self.assertRaises(KeyError):
+            attrs['name']
+        assert attrs.pop('extra') == 3 and dict(attrs) == {'id': 1}
+
+
+class BulkTest(unittest.case.TestCase):
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_bulk_create_without_bulk_endpoint(self, rest_call_mock):
+        def rest_call(url, method, data):
+            if data['name'] == 'invalid':
+                raise restframeworkclient.BadRequestResponse
+            return dict(data, id=len(data['name']))
+        rest_call_mock.side_effect = rest_call
+        customers = [Customer(name='a'), Customer(name='invalid'), Customer(name='bbb')]
+        results = Customer.objects.bulk_create(customers, max_workers=2)
+        assert [result.instance for result in results] == customers
+        assert [type(result.error) for result in results] == [type(None), restframeworkclient.BadRequestResponse,
+                                                               type(None)]
+        assert [customers[0].pk, customers[2].pk] == [1, 3]
+        assert not customers[1]._persisted
+        rest_call_mock.assert_any_call('http://example.org/customers/', method='POST', data={'name': 'bbb'})
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_bulk_create_with_bulk_endpoint(self, rest_call_mock):
+        rest_call_mock.side_effect = lambda url, method, json: [dict(data, id=data['name']) for data in json]
+        tags = [Tag(name=1), Tag(name=2), Tag(name=3)]
+        results = Tag.objects.bulk_create(tags, batch_size=2)
+        assert [result.error for result in results] == [None, None, None]
+        assert [tag.pk for tag in tags] == [1, 2, 3]
+        assert rest_call_mock.call_count == 2
+        rest_call_mock.assert_any_call('http://example.org/tags/bulk/', method='POST', json=[{'name': 1}, {'name': 2}])
+        rest_call_mock.assert_any_call('http://example.org/tags/bulk/', method='POST', json=[{'name': 3}])
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_filter_delete_with_bulk_endpoint(self, rest_call_mock):
+        rest_call_mock.return_value = {
+            'count': 2,
+            'next': None,
+            'previous': None,
+            'results': [{'id': 1}, {'id': 2}],
+        }
+        results = Tag.objects.filter(name='old').delete()
+        assert [result.instance.pk for result in results] == [1, 2]
+        rest_call_mock.assert_called_with('http://example.org/tags/bulk/', method='DELETE', json=[1, 2])
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_filter_update_without_bulk_endpoint(self, rest_call_mock):
+        rest_call_mock.return_value = {
+            'count': 1,
+            'next': None,
+            'previous': None,
+            'results': [{'id': 1, 'status': 'ongoing'}],
+        }
+        customers = Customer.objects.filter(status='ongoing')
+        list(customers)
+        rest_call_mock.return_value = {'id': 1, 'status': 'done'}
+        results = customers.update(status='done')
+        rest_call_mock.assert_called_with('http://example.org/customers/1/', method='PATCH', data={'status': 'done'})
+        assert results[0].instance.status == 'done'
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_manager_does_not_delete_all_instances(self, rest_call_mock):
+        with self.assertRaises(AttributeError):
+            Customer.objects.delete()
+        with self.assertRaises(AttributeError):
+            Request.objects.delete()
+        assert rest_call_mock.call_count == 0
+        rest_call_mock.return_value = {'count': 0, 'next': None, 'previous': None, 'results': []}
+        assert Customer.objects.all().delete() == []
+        assert Customer.objects.update(status='done') == []
+        assert Customer.objects.filter(status='ongoing').update(status='done') == []
+
+    def test_json_body_is_encoded_with_django_json_encoder(self):
+        kwargs = Customer._encode_json_body({'json': [{'created_at': datetime.datetime(2017, 1, 2, 3, 4, 5)}]})
+        assert kwargs == {
+            'data': '[{"created_at": "2017-01-02T03:04:05"}]',
+            'headers': {'Content-Type': 'application/json'},
+        }
+
+
+class JSONCodecTest(unittest.case.TestCase):
+    def test_codecs(self):
+        for name in jsoncodecs.CODECS:
+            try:
+                codec = jsoncodecs._create_codec(name)
+            except ImportError:
+                continue
+            assert codec.loads(b'{"a": [1, 2.5, "\xc3\xa9"]}') == {'a': [1, 2.5, u'\xe9']}
+            assert all(isinstance(value, six.text_type) for value in codec.loads(b'{"ascii": ["a", "b"]}')['ascii'])
+            encoded = codec.dumps({'at': datetime.datetime(2017, 1, 2, 3, 4, 5), 'price': decimal.Decimal('1.10')})
+            assert json.loads(encoded) == {'at': '2017-01-02T03:04:05', 'price': '1.10'}
+
+    @mock.patch('restframeworkclient.models._thread_local')
+    def test_response_bytes_are_decoded_by_codec(self, thread_local_mock):
+        thread_local_mock.session.request.return_value = mock.Mock(status_code=200, content=b'{"id": 1, "name": "a"}')
+        with override_settings(REST_FRAMEWORK_CLIENT={'JSON_CODEC': 'auto'}):
+            json_ = Customer._execute_rest_call('http://example.org/customers/1/', 'GET')
+            assert json_ == {'id': 1, 'name': 'a'} and isinstance(json_['name'], six.text_type)
+            thread_local_mock.session.request.return_value = mock.Mock(status_code=204, content=b'')
+            assert Customer._execute_rest_call('http://example.org/customers/1/', 'DELETE') is None
+
+
+class StreamingTest(unittest.case.TestCase):
+    def test_streamed_page(self):
+        body = b'{"count": 12, "results": [{"id": 1, "name": "J\xc3\xb6hn"}, {"id": 2}, {"id": 345}], "next": null}'
+        read = []
+        chunks = (read.append(body[i:i + 1]) or body[i:i + 1] for i in range(len(body)))
+        close = mock.Mock()
+        page = StreamedPage(chunks, close=close)
+        assert page['count'] == 12
+        assert len(read) < 20
+        results = page['results']
+        assert next(results) == {'id': 1, 'name': u'J\xf6hn'}
+        assert len(read) < 60
+        assert page['next'] is None
+        assert list(results) == [{'id': 2}, {'id': 345}]
+        assert page.finished and page.result_count == 3 and page.size == len(body)
+        close.assert_called_once_with()
+
+        page = StreamedPage(iter([b'{"results": [{"id": 1}, {"id": 2}]']), close=close)
+        assert next(page['results']) == {'id': 1}
+        with self.assertRaises(ValueError):
+            page['next']
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    @mock.patch('restframeworkclient.models._thread_local')
+    def test_instances_are_created_while_receiving_pages(self, thread_local_mock, rest_call_mock):
+        rest_call_mock.side_effect = lambda url, **kwargs: Customer._execute_rest_call(url, 'GET', **kwargs)
+
+        def response(method, url, **kwargs):
+            offset = int(urlparse.parse_qs(urlparse.urlparse(url).query).get('offset', [0])[0])
+            response = requests.models.Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(json.dumps({
+                'count': 4,
+                'next': 'http://example.org/customers/?limit=2&offset=2' if offset == 0 else None,
+                'previous': None,
+                'results': [{'id': pk} for pk in range(offset + 1, offset + 3)],
+            }).encode('utf-8'))
+            responses.append(response)
+            return response
+        responses = []
+        thread_local_mock.session.request.side_effect = response
+        with override_settings(REST_FRAMEWORK_CLIENT={'STREAMING': {'CHUNK_SIZE': 16}}):
+            customers = Customer.objects.filter(a=1).iterator()
+            assert next(customers).pk == 1
+            assert responses[0].raw.tell() < len(responses[0].raw.getvalue())
+            assert [customer.pk for customer in customers] == [2, 3, 4]
+        assert thread_local_mock.session.request.call_count == 2
+        assert thread_local_mock.session.request.call_args[1]['stream'] is True
+
+
+class CompressionTest(unittest.case.TestCase):
+    def test_request_bodies_are_compressed(self):
+        assert compression.prepare_request(Customer, {'data': {'name': 'a' * 2000}}) == {'data': {'name': 'a' * 2000}}
+        options = {'http://example.org': {'ACCEPT_ENCODING': 'gzip', 'MIN_REQUEST_SIZE': 100}}
+        with override_settings(REST_FRAMEWORK_CLIENT={'COMPRESSION': options}):
+            kwargs = compression.prepare_request(Customer, {'data': {'name': 'a' * 200, 'email': None}})
+            assert kwargs['headers'] == {'Accept-Encoding': 'gzip', 'Content-Encoding': 'gzip',
+                                         'Content-Type': 'application/x-www-form-urlencoded'}
+            assert zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS) == 'name=' + 'a' * 200
+
+            kwargs = compression.prepare_request(Customer, {'data': '{"name": "a"}', 'headers': {'X-A': 'b'}})
+            assert kwargs == {'data': '{"name": "a"}', 'headers': {'X-A': 'b', 'Accept-Encoding': 'gzip'}}
+
+            options['http://example.org']['REQUEST_ENCODING'] = 'deflate'
+            kwargs = Customer._encode_json_body({'json': {'name': 'a' * 200}})
+            kwargs = compression.prepare_request(Customer, kwargs)
+            assert kwargs['headers']['Content-Encoding'] == 'deflate'
+            assert json.loads(zlib.decompress(kwargs['data'])) == {'name': 'a' * 200}
+
+
+class UnitOfWorkTest(unittest.case.TestCase):
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_repeated_saves_are_coalesced(self, rest_call_mock):
+        customer = Customer(id=1, name='a', email='a@a.com')
+        customer._persisted = True
+        rest_call_mock.return_value = {'id': 1, 'name': 'b', 'email': 'b@b.com'}
+        with unit_of_work():
+            customer.name = 'b'
+            customer.save()
+            customer.email = 'b@b.com'
+            customer.save(update_fields=['email'])
+            assert rest_call_mock.call_count == 0
+        rest_call_mock.assert_called_once_with('http://example.org/customers/1/', method='PATCH',
+                                               data={'name': 'b', 'email': 'b@b.com'})
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_referenced_instances_are_created_first(self, rest_call_mock):
+        rest_call_mock.side_effect = lambda url, method, data: dict(data, id=123)
+        customer = Customer(name='Smith')
+        device = Device(customer=customer)
+        with unit_of_work():
+            device.save()
+            customer.save()
+        assert rest_call_mock.mock_calls == [
+            mock.call('http://example.org/customers/', method='POST', data={'name': 'Smith'}),
+            mock.call('http://example.org/devices/', method='POST', data={'customer': 123}),
+        ]
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_saves_are_discarded_on_exception(self, rest_call_mock):
+        with self.assertRaises(ValueError):
+            with unit_of_work():
+                Customer(name='Smith').save()
+                raise ValueError
+        assert rest_call_mock.call_count == 0
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_saves_on_thread_pool_join_unit_of_work(self, rest_call_mock):
+        customer = Customer(id=1, name='a')
+        customer._persisted = True
+        rest_call_mock.return_value = {'id': 1, 'name': 'b'}
+        with unit_of_work():
+            customer.name = 'b'
+            assert customer.asave().result() is customer
+            assert rest_call_mock.call_count == 0
+        rest_call_mock.assert_called_once_with('http://example.org/customers/1/', method='PATCH', data={'name': 'b'})
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_instances_saved_by_bulk_operations_are_not_saved_again(self, rest_call_mock):
+        customer = Customer(id=1, name='a')
+        customer._persisted = True
+        rest_call_mock.return_value = {'id': 1, 'name': 'b'}
+        with unit_of_work():
+            customer.name = 'b'
+            customer.save()
+            Customer.objects.bulk_update([customer], ['name'])
+        rest_call_mock.assert_called_once_with('http://example.org/customers/1/', method='PATCH', data={'name': 'b'})
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_middleware_saves_before_returning_response(self, rest_call_mock):
+        rest_call_mock.return_value = {'id': 1, 'name': 'Smith'}
+        middleware = RESTFrameworkClientUnitOfWorkMiddleware()
+        request = RequestFactory().get('/customers/')
+        middleware.process_request(request)
+        customer = Customer(name='Smith').save()
+        assert rest_call_mock.call_count == 0
+        response = object()
+        assert middleware.process_response(request, response) is response
+        rest_call_mock.assert_called_once_with('http://example.org/customers/', method='POST', data={'name': 'Smith'})
+        assert customer.pk == 1 and unitofwork.get_current() is None
+
+    @mock.patch('restframeworkclient.Model._rest_call')
+    def test_middleware_discards_saves_on_exception(self, rest_call_mock):
+        middleware = RESTFrameworkClientUnitOfWorkMiddleware()
+        request = RequestFactory().get('/customers/')
+        middleware.process_request(request)
+        Customer(name='Smith').save()
+        middleware.process_exception(request, ValueError())
+        assert unitofwork.get_current() is None
+        response = object()
+        assert middleware.process_response(request, response) is response
+        assert rest_call_mock.call_count == 0
+
+
+# ModelSimpleTest replaces Model._rest_call for good
+_rest_call = restframeworkclient.Model.__dict__['_rest_call']
+
+
+@mock.patch.object(restframeworkclient.Model, '_rest_call', _rest_call)
+class QueryLogTest(unittest.case.TestCase):
+    def local_settings(self, **kwargs):
+        return override_settings(
+            ROOT_URLCONF=__name__,
+            REST_FRAMEWORK_CLIENT=dict(kwargs, USE_LOCAL_REST_FRAMEWORK=True, LOCAL_TRANSPORT='dispatch',
+                                       BASE_URLS={'example-org': 'http://example.org'}),
+        )
+
+    def test_calls_are_logged(self):
+        with self.local_settings():
+            assert Device(id=1, customer=7).customer.pk == 7
+            assert not connection.queries_logged
+            with querylog.capture() as queries:
+                assert Device(id=2, customer=8).customer.pk == 8
+                with self.assertRaises(Customer.DoesNotExist):
+                    Customer.objects.get(pk=404)
+                assert connection.queries == queries
+        assert [(q['method'], q['url'], q['status'], q['cached'], q['model'], q['field']) for q in queries] == [
+            ('GET', 'http://example.org/customers/8/', 200, False, 'Customer', 'Device.customer'),
+            ('GET', 'http://example.org/customers/404/', 404, False, 'Customer', None),
+        ]
+        assert all(q['time'] >= 0 for q in queries)
+        assert connection.queries == []
+
+    @mock.patch('restframeworkclient.querylog.logger')
+    def test_middleware_logs_sampled_requests(self, logger_mock):
+        request = RequestFactory().get('/devices/')
+        middleware = RESTFrameworkClientQueryLogMiddleware()
+        with self.local_settings(QUERY_LOG=True):
+            middleware.process_request(request)
+            set_request(request)
+            try:
+                Customer.objects.get(pk=1)
+                Customer.objects.get(pk=1)
+            finally:
+                set_request(None)
+            assert [q['cached'] for q in connection.queries] == [False, True]
+            middleware.process_response(request, None)
+        assert not connection.queries_logged
+        args, kwargs = logger_mock.info.call_args
+        assert args[1:4] == ('GET', '/devices/', 2) and len(kwargs['extra']['rest_calls']) == 2
+
+    @mock.patch('restframeworkclient.querylog.logger')
+    def test_middleware_keeps_log_enabled_outside(self, logger_mock):
+        middleware = RESTFrameworkClientQueryLogMiddleware()
+        with querylog.capture() as queries:
+            for rate in (True, None):
+                request = RequestFactory().get('/devices/')
+                with self.local_settings(QUERY_LOG=rate):
+                    middleware.process_request(request)
+                    Customer.objects.get(pk=1)
+                    middleware.process_response(request, None)
+                assert connection.queries_logged
+        assert [q['url'] for q in queries] == ['http://example.org/customers/1/'] * 2
+        assert logger_mock.info.call_count == 1
+
+
+@mock.patch.object(restframeworkclient.Model, '_rest_call', _rest_call)
+class NPlusOneTest(RESTFrameworkClientTestMixin, unittest.case.TestCase):
+    local_settings = QueryLogTest.__dict__['local_settings']
+
+    def test_assert_num_rest_calls(self):
+        with self.local_settings():
+            self.assertNumRestCalls(1, lambda: Device(id=1, customer=7).customer)
+            with self.assertNumRestCalls(2):
+                assert Device(id=1, customer=7).customer.pk == 7
+                assert Customer.objects.aget(pk=8).result().pk == 8
+            with self.assertRaises(AssertionError) as context:
+                with self.assertNumRestCalls(0):
+                    Device(id=1, customer=7).customer
+        assert '1. GET http://example.org/customers/7/ (Device.customer)' in str(context.exception)
+
+    def test_references_dereferenced_in_a_loop_are_detected(self):
+        set_request(RequestFactory().get('/devices/'))
+        try:
+            with self.local_settings(N_PLUS_ONE={'ACTION': 'raise', 'THRESHOLD': 2}):
+                Device(id=1, customer=1).customer
+                Device(id=2, customer=1).customer
+                Customer.objects.get(pk=2)
+                Customer.objects.get(pk=3)
+                with self.assertRaises(restframeworkclient.NPlusOneError) as context:
+                    Device(id=3, customer=4).customer
+        finally:
+            set_request(None)
+        message = str(context.exception)
+        assert 'GET http://example.org/customers/{pk}/ made by Device.customer' in message
+        assert 'test_restframeworkclient.py' in message and "select_related('customer')" in message
+
+    @mock.patch('restframeworkclient.querylog.logger')
+    def test_reverse_references_accessed_in_a_loop_are_detected(self, logger_mock):
+        set_request(RequestFactory().get('/customers/'))
+        try:
+            with self.local_settings(N_PLUS_ONE={'THRESHOLD': 2}):
+                assert [list(Customer(id=pk).devices)[0].pk for pk in range(1, 4)] == [10, 20, 30]
+        finally:
+            set_request(None)
+        message, = logger_mock.warning.call_args[0]
+        assert logger_mock.warning.call_count == 1
+        assert 'GET http://example.org/devices/?customer=... made by Customer.devices' in message
+        assert "prefetch_related('devices')" in message